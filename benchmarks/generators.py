@@ -0,0 +1,94 @@
+# benchmarks/generators.py
+"""Seeded generators for synthetic resumes, JDs (with synonym maps) and experience banks."""
+import csv
+import random
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# Same columns as BANK_HEADERS in src.api.main
+BANK_COLUMNS = [
+    "role_title", "company", "location", "start_yyyy_mm", "end_yyyy_mm",
+    "seniority_level", "function", "industry", "domain", "bullet_text",
+    "skills", "tools", "methods", "outcome_metric", "evidence_link",
+    "confidentiality_ok", "recency_score", "impact_score", "leadership_score",
+    "angle", "keywords_explicit", "bullet_group",
+]
+
+BASE_SKILLS = [
+    "power bi", "sql pipelines", "cross-functional teams", "tableau", "python", "dashboard",
+    "stakeholder management", "data modeling", "etl", "forecasting", "a/b testing", "kpi",
+    "data governance", "machine learning", "excel", "looker", "dbt", "airflow", "snowflake",
+    "product analytics", "roadmap", "budget ownership", "vendor management", "agile",
+]
+_QUALIFIERS = ["cloud", "real-time", "customer", "financial", "marketing", "supply chain",
+               "risk", "pricing", "growth", "retention", "sales", "operations"]
+_OBJECTS = ["reporting", "analytics", "pipelines", "models", "dashboards", "platform",
+            "experiments", "metrics", "automation", "strategy", "insights", "governance"]
+_VERBS = ["Built", "Led", "Owned", "Automated", "Designed", "Delivered", "Scaled", "Presented"]
+_FILLER = ["for execs", "across regions", "with 5 analysts", "cutting cost 20%",
+           "in 3 months", "for 12 markets", "end to end", "from scratch"]
+
+def vocabulary(size: int = 200) -> List[str]:
+    """Base skills plus qualifier/object compounds ("risk analytics"), deterministic order."""
+    compounds = [f"{q} {o}" for q in _QUALIFIERS for o in _OBJECTS]
+    return (BASE_SKILLS + compounds)[:size]
+
+def make_jd(rng: random.Random, vocab: List[str], n_terms: int = 40) -> Tuple[List[str], Dict[str, List[str]]]:
+    """(must_terms, synonyms) with hyphen/space and singular/plural variants for some terms."""
+    terms = rng.sample(vocab, min(n_terms, len(vocab)))
+    synonyms: Dict[str, List[str]] = {}
+    for t in terms:
+        variants = []
+        if " " in t:
+            variants.append(t.replace(" ", "-"))
+        if "-" in t:
+            variants.append(t.replace("-", " "))
+        variants.append(t[:-1] if t.endswith("s") else t + "s")
+        if rng.random() < 0.3:
+            variants.append(rng.choice(vocab))
+        synonyms[t] = variants
+    return terms, synonyms
+
+def make_bullet(rng: random.Random, vocab: List[str]) -> str:
+    skills = rng.sample(vocab, rng.randint(1, 3))
+    return f"{rng.choice(_VERBS)} {' and '.join(skills)} {rng.choice(_FILLER)}"
+
+def make_resume(rng: random.Random, vocab: List[str], n_bullets: int = 20) -> str:
+    lines = ["HEADLINE", "Data Analyst", "", "SUMMARY", make_bullet(rng, vocab), "", "EXPERIENCE"]
+    lines += [f"- {make_bullet(rng, vocab)}" for _ in range(n_bullets)]
+    lines += ["", "SKILLS", ", ".join(rng.sample(vocab, 10)), "", "CERTIFICATIONS", "-"]
+    return "\n".join(lines) + "\n"
+
+def make_bank_rows(rng: random.Random, vocab: List[str], n_bullets: int) -> List[Dict[str, str]]:
+    """`n_bullets` bank rows spread over roughly n/8 roles, every BANK_COLUMNS key present."""
+    n_roles = max(1, n_bullets // 8)
+    roles = [
+        {
+            "role_title": f"{rng.choice(['Analytics', 'BI', 'Data', 'Product'])} "
+                          f"{rng.choice(['Manager', 'Lead', 'Analyst', 'Director'])}",
+            "company": f"Company{r}",
+            "location": rng.choice(["HK", "SG", "London", "NYC"]),
+            "start_yyyy_mm": f"{2010 + r % 12}-01",
+            "end_yyyy_mm": f"{2011 + r % 12}-12",
+        }
+        for r in range(n_roles)
+    ]
+    rows = []
+    for _ in range(n_bullets):
+        row = {c: "" for c in BANK_COLUMNS}
+        row.update(rng.choice(roles))
+        row["bullet_text"] = make_bullet(rng, vocab)
+        row["skills"] = ";".join(rng.sample(vocab, 2))
+        row["confidentiality_ok"] = "TRUE"
+        for c in ("recency_score", "impact_score", "leadership_score"):
+            row[c] = f"{rng.random():.2f}"
+        rows.append(row)
+    return rows
+
+def write_bank(path: Path, rows: List[Dict[str, str]]) -> str:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=BANK_COLUMNS)
+        w.writeheader()
+        w.writerows(rows)
+    return str(path)
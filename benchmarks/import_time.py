@@ -0,0 +1,99 @@
+# benchmarks/import_time.py
+"""
+Cold-start (import time) benchmark.
+
+    python -m benchmarks.import_time                    # compare to baseline
+    python -m benchmarks.import_time --update-baseline  # re-record benchmarks/import_baseline.json
+
+Each module is imported in a fresh interpreter (best of --repeat runs) and timed with
+`-X importtime`, so the numbers are the module's own cumulative import cost without
+interpreter start-up. Modules that cannot be imported here (e.g. `src.api.main` without
+its dependencies) are reported and skipped. Regressions use the same rule as
+`benchmarks.run`: slower than baseline by more than --tolerance and by more than --min-delta.
+"""
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from benchmarks.run import compare
+
+ROOT = Path(__file__).resolve().parents[1]
+BASELINE_PATH = Path(__file__).with_name("import_baseline.json")
+DEFAULT_MODULES = [
+    "src.api.main",
+    "src.tools.scoring",
+    "src.tools.bank",
+    "src.tools.promotions",
+    "src.common.llm",
+]
+
+def import_time(module: str) -> Tuple[Optional[float], List[Tuple[float, str]]]:
+    """
+    (seconds, heaviest imports) of importing `module` in a fresh interpreter, or
+    (None, []) when it fails to import. Heaviest = top 5 by self time.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        return None, []
+    total = None
+    own: List[Tuple[float, str]] = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = [p.strip() for p in line[len("import time:"):].split("|")]
+        if not parts[0].isdigit():
+            continue                            # header line
+        self_us, cumulative_us, name = int(parts[0]), int(parts[1]), parts[2].strip()
+        if name == "site":
+            own = []                            # interpreter start-up, not the module
+            continue
+        own.append((self_us / 1e6, name))
+        if name == module:
+            total = cumulative_us / 1e6
+    own.sort(reverse=True)
+    return total, own[:5]
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--modules", nargs="+", default=DEFAULT_MODULES)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--baseline", default=str(BASELINE_PATH))
+    ap.add_argument("--tolerance", type=float, default=0.5, help="allowed slowdown, 0.5 = +50%%")
+    ap.add_argument("--min-delta", type=float, default=0.05, help="ignore slowdowns under this (s)")
+    ap.add_argument("--update-baseline", action="store_true")
+    args = ap.parse_args(argv)
+
+    results: Dict[str, Dict[str, float]] = {}
+    for module in args.modules:
+        runs = [import_time(module) for _ in range(args.repeat)]
+        timed = [r for r in runs if r[0] is not None]
+        if not timed:
+            print(f"{module:>30}  not importable, skipped", flush=True)
+            continue
+        seconds, heaviest = min(timed)
+        results[f"import:{module}"] = {"cold": round(seconds, 6)}
+        top = ", ".join(f"{name} {s * 1000:.0f}ms" for s, name in heaviest[:3])
+        print(f"{module:>30}  {seconds * 1000:8.1f} ms   ({top})", flush=True)
+
+    if args.update_baseline:
+        Path(args.baseline).write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    baseline_path = Path(args.baseline)
+    if not baseline_path.exists():
+        print(f"no baseline at {baseline_path}; run with --update-baseline to record one")
+        return 0
+    failures = compare(results, json.loads(baseline_path.read_text()), args.tolerance, args.min_delta)
+    for f in failures:
+        print(f"REGRESSION {f}", file=sys.stderr)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+# benchmarks/run.py
+"""
+Scaling benchmarks for scoring and experience bank stages.
+
+    python -m benchmarks.run                        # sizes 10..10k, compare to baseline
+    python -m benchmarks.run --full                 # sizes 10..100k (quadratic stages show here)
+    python -m benchmarks.run --sizes 1000 100000
+    python -m benchmarks.run --full --update-baseline   # re-record benchmarks/baseline.json
+
+Each stage is timed (best of --repeat runs) on a seeded synthetic resume, JD and bank of
+every size. Results go to --out as JSON; --update-baseline only replaces the sizes that
+were run, so a quick run never drops the 100k entries. The run exits non-zero when a stage is slower
+than its stored baseline by more than --tolerance (and by more than --min-delta seconds,
+so sub-millisecond noise never fails it).
+"""
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.generators import make_bank_rows, make_jd, make_resume, vocabulary, write_bank
+from src.tools.bank import clear_bank_cache, load_bank
+from src.tools.promotions import evaluate_bank_swaps
+from src.tools.role_index import RoleIndex
+from src.tools.scoring import clear_jd_profile_cache, compute_metrics
+from src.tools.term_index import BankTermIndex
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+FULL_SIZES = DEFAULT_SIZES + [100000]
+
+def _best_of(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t)
+    return best
+
+def _api_functions() -> Optional[Dict[str, Callable]]:
+    """The bank functions of the API module, when it is importable."""
+    try:
+        from src.api import main as api_main
+    except ImportError:
+        return None
+    return {
+        "filter_bullets_for_relevance": api_main.filter_bullets_for_relevance,
+        "backfill_role_bullets": api_main.backfill_role_bullets,
+        "propose_jd_promotions": api_main.propose_jd_promotions,
+    }
+
+def bench_size(n: int, seed: int, repeat: int, workdir: Path) -> Dict[str, float]:
+    """Time every stage for a bank of `n` bullets (resume length grows with n, capped)."""
+    rng = random.Random(seed + n)
+    vocab = vocabulary(200)
+    terms, syns = make_jd(rng, vocab, n_terms=min(150, max(10, n // 10)))
+    resume = make_resume(rng, vocab, n_bullets=min(n, 300))
+    bank = write_bank(workdir / f"bank_{n}.csv", make_bank_rows(rng, vocab, n))
+    selected = [line[2:] for line in resume.splitlines() if line.startswith("- ")][:12]
+    report = compute_metrics(resume, terms, syns)
+
+    def cold_metrics():
+        clear_jd_profile_cache()
+        compute_metrics(resume, terms, syns)
+
+    def cold_bank():
+        clear_bank_cache()
+        load_bank(bank)
+
+    out = {
+        "compute_metrics": _best_of(cold_metrics, repeat),
+        "compute_metrics_warm": _best_of(lambda: compute_metrics(resume, terms, syns), repeat),
+        "load_bank": _best_of(cold_bank, repeat),
+    }
+    df = load_bank(bank)
+    bullets = df["bullet_text"].tolist()
+    term_variants = {t: syns.get(t, []) for t in terms}
+
+    def index_filter():
+        BankTermIndex(bullets).bullets_with_min_matches(term_variants, min_matches=1)
+
+    def role_backfill():
+        roles = RoleIndex(df)
+        for role in roles.group_by_role(bullets[:12]):
+            roles.top_k(role, 3, exclude=selected)
+
+    out["index_filter"] = _best_of(index_filter, repeat)
+    out["role_backfill"] = _best_of(role_backfill, repeat)
+    out["evaluate_bank_swaps"] = _best_of(
+        lambda: evaluate_bank_swaps(selected, terms, syns, bank, max_promotions=3), repeat
+    )
+
+    api = _api_functions()
+    if api is not None:
+        alignment_report = {"targets": {"density_target_atomic": 2}, "atomic": report}
+        out["filter_bullets_for_relevance"] = _best_of(lambda: api["filter_bullets_for_relevance"](
+            bullets, terms, syns, min_matches=1, max_keep=8), repeat)
+        out["backfill_role_bullets"] = _best_of(lambda: api["backfill_role_bullets"](
+            selected_bullets=selected, jd_atomic=terms, atomic_synonyms=syns, bank_path=bank,
+            per_role_min=3, top_roles=2, max_total=16), repeat)
+        out["propose_jd_promotions"] = _best_of(lambda: api["propose_jd_promotions"](
+            alignment_report=alignment_report, selected_bullets=selected, jd_atomic=terms,
+            atomic_synonyms=syns, bank_path=bank, max_promotions=3), repeat)
+    return out
+
+def compare(results: Dict, baseline: Dict, tolerance: float, min_delta: float) -> List[str]:
+    """Human-readable regressions of `results` against `baseline` ({stage: {size: s}})."""
+    failures = []
+    for stage, by_size in results.items():
+        for size, seconds in by_size.items():
+            base = baseline.get(stage, {}).get(size)
+            if base is None:
+                continue
+            if seconds > base * (1 + tolerance) and seconds - base > min_delta:
+                failures.append(f"{stage} @ {size}: {seconds:.4f}s vs baseline {base:.4f}s")
+    return failures
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", type=int, nargs="+", default=None)
+    ap.add_argument("--full", action="store_true", help=f"sizes {FULL_SIZES}")
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--out", default="bench_results.json")
+    ap.add_argument("--baseline", default=str(BASELINE_PATH))
+    ap.add_argument("--tolerance", type=float, default=0.5, help="allowed slowdown, 0.5 = +50%%")
+    ap.add_argument("--min-delta", type=float, default=0.02, help="ignore slowdowns under this (s)")
+    ap.add_argument("--update-baseline", action="store_true")
+    args = ap.parse_args(argv)
+
+    sizes = args.sizes or (FULL_SIZES if args.full else DEFAULT_SIZES)
+    results: Dict[str, Dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            for stage, seconds in bench_size(n, args.seed, args.repeat, Path(tmp)).items():
+                results.setdefault(stage, {})[str(n)] = round(seconds, 6)
+                print(f"{stage:>30} {n:>7}  {seconds * 1000:10.2f} ms", flush=True)
+
+    Path(args.out).write_text(json.dumps(results, indent=2, sort_keys=True))
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        merged = json.loads(baseline_path.read_text()) if baseline_path.exists() else {}
+        for stage, by_size in results.items():
+            merged.setdefault(stage, {}).update(by_size)
+        baseline_path.write_text(json.dumps(merged, indent=2, sort_keys=True) + "\n")
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    if not baseline_path.exists():
+        print(f"no baseline at {baseline_path}; run with --update-baseline to record one")
+        return 0
+    failures = compare(results, json.loads(baseline_path.read_text()), args.tolerance, args.min_delta)
+    for f in failures:
+        print(f"REGRESSION {f}", file=sys.stderr)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
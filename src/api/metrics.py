@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from src.common.metrics import attach_collector, get_collector
+
+# Mount with `app.include_router(metrics.router)`; recording starts at `attach_collector()`
+router = APIRouter()
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics() -> PlainTextResponse:
+    """Stage latency histograms and counters in Prometheus text format."""
+    collector = get_collector()
+    body = collector.render() if collector is not None else ""
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
+
+def enable_metrics(app) -> None:
+    """Attach the collector and expose /metrics on `app` (call once at startup)."""
+    attach_collector()
+    app.include_router(router)
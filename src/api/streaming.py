@@ -0,0 +1,101 @@
+import json
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+# Fields of a compute_metrics report that are streamed to the client after each pass
+REPORT_FIELDS = ("coverage", "missing_terms", "low_density_terms", "placement_ratio")
+
+def summarize_report(report: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The streamable part of an alignment report.
+
+    Works on a flat `compute_metrics` report, or on a report that nests several of them
+    (e.g. {"phrases": {...}, "atomic": {...}}), which is summarized per key.
+    """
+    if "coverage" in report:
+        return {k: report[k] for k in REPORT_FIELDS if k in report}
+    return {
+        k: summarize_report(v) for k, v in report.items()
+        if isinstance(v, dict) and (
+            "coverage" in v or any(isinstance(x, dict) and "coverage" in x for x in v.values())
+        )
+    }
+
+def alignment_event(
+    iteration: int,
+    report: Optional[Dict[str, Any]] = None,
+    promotions: Optional[List[Dict[str, Any]]] = None,
+    event: str = "iteration",
+    **extra,
+) -> Dict[str, Any]:
+    """One progress event: iteration number, report summary and/or proposed promotions."""
+    out: Dict[str, Any] = {"event": event, "iteration": iteration}
+    if report is not None:
+        out["report"] = summarize_report(report)
+    if promotions is not None:
+        out["promotions"] = promotions
+    out.update(extra)
+    return out
+
+async def realign_events(
+    score: Callable[[], Awaitable[Dict[str, Any]]],
+    propose: Callable[[Dict[str, Any]], Awaitable[List[Dict[str, Any]]]],
+    apply: Callable[[List[Dict[str, Any]]], Awaitable[None]],
+    targets_met: Callable[[Dict[str, Any]], bool],
+    max_iterations: int,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Drive a realign loop as a stream of events.
+
+    The first event is emitted right after the first scoring pass, so time-to-first-byte
+    is one `score()` call. Each iteration then emits the proposed promotions and the report
+    after applying them; a final "done" event carries the stop reason
+    ("targets_met" | "no_promotions" | "max_iterations").
+    """
+    report = await score()
+    yield alignment_event(0, report)
+    iteration, reason = 0, "max_iterations"
+    while not targets_met(report):
+        if iteration >= max_iterations:
+            break
+        iteration += 1
+        promotions = await propose(report)
+        yield alignment_event(iteration, promotions=promotions, event="promotions")
+        if not promotions:
+            reason = "no_promotions"
+            break
+        await apply(promotions)
+        report = await score()
+        yield alignment_event(iteration, report)
+    else:
+        reason = "targets_met"
+    yield alignment_event(iteration, event="done", reason=reason)
+
+async def _ndjson(events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    async for e in events:
+        yield json.dumps(e, ensure_ascii=False, default=str) + "\n"
+
+async def _sse(events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    async for e in events:
+        data = json.dumps(e, ensure_ascii=False, default=str)
+        yield f"event: {e.get('event', 'message')}\ndata: {data}\n\n"
+
+def stream_events(
+    events: AsyncIterator[Dict[str, Any]],
+    request: Optional[Request] = None,
+    fmt: Optional[str] = None,
+) -> StreamingResponse:
+    """
+    Wrap an event stream as NDJSON (default) or server-sent events.
+
+    SSE is used when `fmt == "sse"` or the client sends `Accept: text/event-stream`.
+    Proxy buffering is disabled so each event is flushed as soon as it is produced.
+    """
+    accept = request.headers.get("accept", "") if request is not None else ""
+    use_sse = fmt == "sse" or (fmt is None and "text/event-stream" in accept)
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    if use_sse:
+        return StreamingResponse(_sse(events), media_type="text/event-stream", headers=headers)
+    return StreamingResponse(_ndjson(events), media_type="application/x-ndjson", headers=headers)
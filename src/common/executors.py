@@ -0,0 +1,50 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+# Size and kind of the pool CPU-heavy request stages (scoring, bank parsing, rendering) run in.
+# "thread" keeps shared caches (JD profiles, banks) in one place; "process" sidesteps the GIL.
+CPU_WORKERS = int(os.getenv("CPU_WORKERS", str(min(8, os.cpu_count() or 2))))
+CPU_POOL = os.getenv("CPU_POOL", "thread")
+
+_executor: Optional[Executor] = None
+_executor_lock = threading.Lock()
+
+def _init_cpu_worker() -> None:
+    """Warm each pool process (banks, variants, JD matchers) before it takes work."""
+    from src.tools.warmup import warm_up_from_env
+
+    warm_up_from_env()
+
+def get_cpu_executor() -> Executor:
+    """The process-wide bounded pool for CPU-bound work, created on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            if CPU_POOL == "process":
+                _executor = ProcessPoolExecutor(max_workers=CPU_WORKERS, initializer=_init_cpu_worker)
+            else:
+                _executor = ThreadPoolExecutor(max_workers=CPU_WORKERS, thread_name_prefix="cpu")
+        return _executor
+
+async def run_cpu(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run `fn(*args, **kwargs)` in the CPU pool and await the result.
+
+    Use this from async endpoints for anything that would otherwise hold the event loop
+    (compute_metrics, bank loading, docx rendering) so other requests keep being served.
+    With CPU_POOL=process, `fn` and its arguments must be picklable.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_cpu_executor(), partial(fn, *args, **kwargs))
+
+def shutdown_cpu_executor(wait: bool = True) -> None:
+    """Stop the pool (app shutdown / tests); the next `run_cpu` creates a fresh one."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait)
+            _executor = None
@@ -0,0 +1,107 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.common.llm_cache import cache_key, get_llm_cache
+from src.common.metrics import inc, stage
+
+# Connection pool of the shared client, and how many LLM calls may be in flight:
+# process-wide, and per API request (one /realign should not starve the others)
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "32"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+LLM_REQUEST_CONCURRENCY = int(os.getenv("LLM_REQUEST_CONCURRENCY", "4"))
+LLM_TIMEOUT_S = float(os.getenv("LLM_TIMEOUT_S", "60"))
+
+_client = None
+_global_limit: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = None
+_request_limit: ContextVar[Optional[asyncio.Semaphore]] = ContextVar("llm_request_limit", default=None)
+
+def get_async_client():
+    """
+    The shared `AsyncOpenAI` client, created on first use.
+
+    One client per process means one pooled set of keep-alive connections instead of a
+    new client (and TLS handshake) per call. OPENAI_BASE_URL can point it at a local fake
+    server (see `src.tools.fake_llm`) for load tests.
+    """
+    global _client
+    if _client is None:
+        import httpx
+        from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+        _client = AsyncOpenAI(
+            base_url=os.getenv("OPENAI_BASE_URL") or None,
+            timeout=LLM_TIMEOUT_S,
+            http_client=DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=LLM_MAX_CONNECTIONS,
+                    max_keepalive_connections=LLM_MAX_CONNECTIONS,
+                ),
+            ),
+        )
+    return _client
+
+async def close_async_client() -> None:
+    """Close the shared client's connection pool (app shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+def _global_semaphore() -> asyncio.Semaphore:
+    # semaphores belong to one event loop; rebuild if the loop changed (e.g. between tests)
+    global _global_limit
+    loop = asyncio.get_running_loop()
+    if _global_limit is None or _global_limit[0] is not loop:
+        _global_limit = (loop, asyncio.Semaphore(LLM_MAX_CONCURRENCY))
+    return _global_limit[1]
+
+@asynccontextmanager
+async def llm_request_scope(max_concurrency: Optional[int] = None):
+    """
+    Cap the LLM calls one API request can have in flight (default LLM_REQUEST_CONCURRENCY).
+
+    Wrap an endpoint body in `async with llm_request_scope():`; every `chat_completion`
+    awaited inside it (including from tasks it spawns) shares the request's limit.
+    """
+    token = _request_limit.set(asyncio.Semaphore(max_concurrency or LLM_REQUEST_CONCURRENCY))
+    try:
+        yield
+    finally:
+        _request_limit.reset(token)
+
+async def chat_completion(
+    messages: List[Dict[str, Any]],
+    model: str,
+    use_cache: bool = True,
+    **params,
+) -> str:
+    """
+    One chat completion through the shared client, under the request and global limits.
+
+    Responses are served from / stored in the on-disk LLM cache, keyed by model, the
+    whitespace-normalized messages and `params`; pass `use_cache=False` to bypass it.
+    """
+    cache = get_llm_cache() if use_cache else None
+    key = cache_key(model, messages, params) if cache is not None else None
+    if cache is not None:
+        hit = await asyncio.to_thread(cache.get, key)
+        if hit is not None:
+            inc("llm_cache_hits")
+            return hit
+        inc("llm_cache_misses")
+
+    # request limit first, so a request waiting on its own cap holds no global slot
+    async with _request_limit.get() or nullcontext():
+        async with _global_semaphore():
+            with stage("llm"):
+                resp = await get_async_client().chat.completions.create(
+                    model=model, messages=messages, **params
+                )
+    content = resp.choices[0].message.content or ""
+
+    if cache is not None:
+        await asyncio.to_thread(cache.put, key, content)
+    return content
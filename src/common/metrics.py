@@ -0,0 +1,137 @@
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+from typing import Callable, Dict, List, Optional, Sequence
+
+# Latency buckets (seconds) of the per-stage histograms
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+METRIC_PREFIX = "ats"
+
+class Collector:
+    """
+    In-process store of stage latency histograms and counters, rendered as Prometheus text.
+
+    Histograms are labelled by stage name (bank_load, section_parse, term_match,
+    promotions, llm, docx_render, ...); counters are plain totals (terms_scored,
+    variants_matched, bank_rows_scanned, ...).
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._hist: Dict[str, List] = {}       # stage -> [bucket counts..., sum, count]
+        self._counters: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float) -> None:
+        i = bisect_left(self.buckets, seconds)
+        with self._lock:
+            h = self._hist.get(stage)
+            if h is None:
+                h = self._hist[stage] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            h[i] += 1
+            h[-2] += seconds
+            h[-1] += 1
+
+    def inc(self, name: str, n: float = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """{"stages": {stage: {"count", "sum"}}, "counters": {...}} (for tests / debugging)."""
+        with self._lock:
+            return {
+                "stages": {s: {"count": h[-1], "sum": h[-2]} for s, h in self._hist.items()},
+                "counters": dict(self._counters),
+            }
+
+    def render(self) -> str:
+        """Prometheus text exposition format (0.0.4)."""
+        name = f"{METRIC_PREFIX}_stage_seconds"
+        lines = [
+            f"# HELP {name} Latency of instrumented request stages.",
+            f"# TYPE {name} histogram",
+        ]
+        with self._lock:
+            hist = {s: list(h) for s, h in self._hist.items()}
+            counters = dict(self._counters)
+        for stage in sorted(hist):
+            h = hist[stage]
+            cumulative = 0
+            for le, n in zip(list(self.buckets) + ["+Inf"], h[:-2]):
+                cumulative += n
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {h[-2]}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {h[-1]}')
+        for counter in sorted(counters):
+            full = f"{METRIC_PREFIX}_{counter}_total"
+            lines.append(f"# TYPE {full} counter")
+            lines.append(f"{full} {counters[counter]}")
+        return "\n".join(lines) + "\n"
+
+_collector: Optional[Collector] = None
+
+def attach_collector(buckets: Sequence[float] = DEFAULT_BUCKETS) -> Collector:
+    """Start recording (app startup). Until this is called every hook is a no-op."""
+    global _collector
+    if _collector is None:
+        _collector = Collector(buckets)
+    return _collector
+
+def detach_collector() -> None:
+    global _collector
+    _collector = None
+
+def get_collector() -> Optional[Collector]:
+    return _collector
+
+class _Stage:
+    __slots__ = ("collector", "name", "started")
+
+    def __init__(self, collector: Collector, name: str):
+        self.collector = collector
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.collector.observe(self.name, time.perf_counter() - self.started)
+        return False
+
+class _NoStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NO_STAGE = _NoStage()
+
+def stage(name: str):
+    """`with stage("term_match"): ...` records the block's latency when a collector is attached."""
+    collector = _collector
+    return _NO_STAGE if collector is None else _Stage(collector, name)
+
+def timed(name: str) -> Callable:
+    """Decorator form of `stage` for whole functions."""
+    def wrap(fn: Callable) -> Callable:
+        @wraps(fn)
+        def inner(*args, **kwargs):
+            collector = _collector
+            if collector is None:
+                return fn(*args, **kwargs)
+            with _Stage(collector, name):
+                return fn(*args, **kwargs)
+        return inner
+    return wrap
+
+def inc(name: str, n: float = 1) -> None:
+    """Bump a counter when a collector is attached."""
+    collector = _collector
+    if collector is not None:
+        collector.inc(name, n)
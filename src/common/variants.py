@@ -0,0 +1,191 @@
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from functools import wraps
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.common.metrics import inc
+
+# Bounded, process-wide term -> variants cache, optionally warmed from a vocabulary file
+VARIANT_CACHE_SIZE = int(os.getenv("VARIANT_CACHE_SIZE", "20000"))
+VARIANT_VOCAB_PATH = os.getenv("VARIANT_VOCAB_PATH", "")
+
+def _norm_term(term: str) -> str:
+    return re.sub(r"\s+", " ", str(term or "").strip().lower())
+
+class VariantCache:
+    """
+    Thread-safe LRU of normalized term -> variant tuple.
+
+    Values are tuples so the shared entries cannot be mutated by callers. Hits and misses
+    are counted on the instance and reported as `<name>_hits` / `<name>_misses` metrics.
+    """
+
+    def __init__(self, maxsize: int = VARIANT_CACHE_SIZE, name: str = "variant_cache"):
+        self.maxsize = maxsize
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[str, Tuple[str, ...]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, term: str, generate: Callable[[str], Iterable[str]]) -> Tuple[str, ...]:
+        key = _norm_term(term)
+        with self._lock:
+            hit = self._data.get(key)
+            if hit is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+        if hit is not None:
+            inc(f"{self.name}_hits")
+            return hit
+        value = tuple(generate(key))
+        with self._lock:
+            self.misses += 1
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        inc(f"{self.name}_misses")
+        return value
+
+    def terms(self) -> List[str]:
+        """Cached terms, most recently used first."""
+        with self._lock:
+            return list(reversed(self._data))
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+def memoize_variants(fn: Callable[[str], Iterable[str]]) -> Callable[[str], List[str]]:
+    """
+    Share one bounded cache for a per-term variant generator across the whole process.
+
+    The wrapped function normalizes the term (lowercase, collapsed whitespace), serves
+    known terms from the cache and returns a fresh list each call. The cache is exposed as
+    `fn.cache`.
+    """
+    cache = VariantCache()
+
+    @wraps(fn)
+    def inner(term: str) -> List[str]:
+        return list(cache.get_or_compute(term, fn))
+
+    inner.cache = cache
+    return inner
+
+# Shortest last word that gets a singular/plural variant
+_MIN_INFLECT_LEN = 4
+
+def _plural_forms(phrase: str) -> List[str]:
+    """
+    Singular/plural of the last word: team <-> teams, policy <-> policies, analysis <->
+    analyses, database <-> databases. Where the singular of an "-es" plural is ambiguous
+    (batches / caches) both candidates are returned. Last words of `_MIN_INFLECT_LEN` - 1
+    characters or fewer (aws, js, ios, bi) are usually acronyms and are left alone, as are
+    "-is" words with a short stem (apis, basis).
+    """
+    cut = max(phrase.rfind(" "), phrase.rfind("-")) + 1      # "power-bi": last word is "bi"
+    prefix, last = phrase[:cut], phrase[cut:]
+    if len(last) < _MIN_INFLECT_LEN or not last[-1].isalpha():
+        return []
+    if last.endswith("ies"):
+        forms = [last[:-3] + "y"]
+    elif last.endswith(("yses", "eses")):
+        forms = [last[:-2] + "is"]                  # analyses, hypotheses
+    elif last.endswith(("sses", "xes", "shes", "zzes")):
+        forms = [last[:-2]]                         # processes, boxes
+    elif last.endswith(("ches", "uses")):
+        forms = [last[:-2], last[:-1]]              # batches / caches, statuses / causes
+    elif last.endswith("is"):
+        forms = [last[:-2] + "es"] if len(last) - 2 >= _MIN_INFLECT_LEN else []
+    elif last.endswith("us"):
+        forms = []
+    elif last.endswith("s") and not last.endswith("ss"):
+        forms = [last[:-1]]
+    elif last.endswith("y") and len(last) > 1 and last[-2] not in "aeiou":
+        forms = [last[:-1] + "ies"]
+    elif last.endswith(("s", "x", "ch", "sh")):
+        forms = [last + "es"]
+    else:
+        forms = [last + "s"]
+    return [prefix + f for f in forms]
+
+@memoize_variants
+def term_variants(term: str) -> List[str]:
+    """
+    Canonical variants of one JD term: the term itself, its hyphen/space spellings
+    ("cross-functional teams" / "cross functional teams", "power bi" / "power-bi") and
+    the singular/plural of each ("cross functional team").
+    """
+    spellings = [term]
+    if "-" in term:
+        spellings.append(term.replace("-", " "))
+    if " " in term:
+        spellings.append(term.replace(" ", "-"))
+    out = list(spellings)
+    for s in spellings:
+        out.extend(_plural_forms(s))
+    return list(dict.fromkeys(v for v in out if v))
+
+def canonical_variant_map(
+    terms: Iterable[str],
+    synonyms: Optional[Dict[str, List[str]]] = None,
+) -> Dict[str, List[str]]:
+    """
+    term -> variants map for `compute_metrics`: the cached variants of each term and of each
+    of its synonyms, first occurrence order, the term itself excluded.
+    """
+    syn = {_norm_term(k): v for k, v in (synonyms or {}).items()}
+    out: Dict[str, List[str]] = {}
+    for term in terms:
+        key = _norm_term(term)
+        if not key:
+            continue
+        variants = list(term_variants(key))
+        for s in syn.get(key) or ():
+            variants.extend(term_variants(s))
+        out[key] = [v for v in dict.fromkeys(variants) if v != key]
+    return out
+
+def load_vocabulary(path: str) -> List[str]:
+    """Terms from a JSON list or a plain text file (one term per line, '#' comments)."""
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    if text.lstrip().startswith("["):
+        return [str(t) for t in json.loads(text)]
+    return [line.strip() for line in text.splitlines() if line.strip() and not line.startswith("#")]
+
+def warm_variant_cache(
+    path: Optional[str] = None,
+    generate: Callable[[str], List[str]] = term_variants,
+) -> int:
+    """
+    Precompute variants for every term of a persisted skills vocabulary (startup).
+
+    `path` defaults to VARIANT_VOCAB_PATH; returns the number of terms warmed (0 when no
+    vocabulary is configured or the file does not exist).
+    """
+    path = path or VARIANT_VOCAB_PATH
+    if not path or not os.path.exists(path):
+        return 0
+    terms = load_vocabulary(path)
+    for t in terms:
+        generate(t)
+    return len(terms)
+
+def save_vocabulary(path: str, generate: Callable[[str], List[str]] = term_variants) -> int:
+    """Persist the currently cached terms (most recently used first) for the next warm-up."""
+    terms = generate.cache.terms()
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write("\n".join(terms) + ("\n" if terms else ""))
+    os.replace(tmp, path)
+    return len(terms)
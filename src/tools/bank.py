@@ -0,0 +1,161 @@
+import os
+import threading
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+from src.common.metrics import inc, stage
+
+if TYPE_CHECKING:                       # pandas is imported on first parse, not at import time
+    import numpy as np
+    import pandas as pd
+
+# Numeric columns parsed as floats (blank / malformed -> 0.0)
+SCORE_COLUMNS = ["recency_score", "impact_score", "leadership_score"]
+
+# Low-cardinality columns stored as pandas categoricals (role tuple + descriptors)
+ROLE_COLUMNS = ["role_title", "company", "location", "start_yyyy_mm", "end_yyyy_mm"]
+CATEGORY_COLUMNS = ROLE_COLUMNS + ["seniority_level", "function", "industry", "domain", "angle"]
+
+# Compiled sidecar written next to the CSV: experience_bank.csv -> experience_bank.csv.bank.npz
+SIDECAR_SUFFIX = ".bank.npz"
+
+_bank_cache: Dict[str, Tuple[Tuple[int, int], "pd.DataFrame"]] = {}
+_bank_lock = threading.Lock()
+
+def _signature(path: str) -> Tuple[int, int]:
+    """(mtime_ns, size) of a file; changes whenever the bank CSV is rewritten."""
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+def sidecar_path(bank_path: str) -> str:
+    return bank_path + SIDECAR_SUFFIX
+
+def read_bank_csv(bank_path: str) -> "pd.DataFrame":
+    """
+    Parse an experience bank CSV into a typed frame:
+
+    - every column is read as text ("" for blanks, no NaN)
+    - SCORE_COLUMNS become floats, CATEGORY_COLUMNS become categoricals
+    - missing expected columns are added (blank / 0.0), like the test bank writer does
+    """
+    import pandas as pd
+
+    df = pd.read_csv(bank_path, dtype=str, keep_default_na=False)
+    for c in ["bullet_text"] + CATEGORY_COLUMNS:
+        if c not in df.columns:
+            df[c] = ""
+    for c in SCORE_COLUMNS:
+        if c not in df.columns:
+            df[c] = ""
+        df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0.0).astype("float64")
+    for c in CATEGORY_COLUMNS:
+        df[c] = df[c].astype("category")
+    return df
+
+def _pack_text(values) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Strings as one UTF-8 byte blob plus end offsets (fixed-width unicode wastes space)."""
+    import numpy as np
+
+    encoded = [str(v).encode("utf-8") for v in values]
+    ends = np.cumsum([len(b) for b in encoded], dtype=np.int64)
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), ends
+
+def _unpack_text(blob: "np.ndarray", ends: "np.ndarray") -> list:
+    raw = blob.tobytes()
+    starts = [0] + ends[:-1].tolist()
+    return [raw[a:b].decode("utf-8") for a, b in zip(starts, ends.tolist())]
+
+def compile_bank(bank_path: str, df: Optional["pd.DataFrame"] = None) -> str:
+    """
+    Write the compiled sidecar for `bank_path` and return its path.
+
+    The sidecar is a plain `.npz` of the typed frame's columns (categorical codes +
+    categories, floats, text as UTF-8 blobs) plus the CSV's (mtime, size) signature, so a cold load skips
+    CSV parsing and type conversion. It holds no pickles, is only trusted while the
+    signature matches, and any problem reading it falls back to the CSV.
+    """
+    import numpy as np
+
+    sig = _signature(bank_path)
+    if df is None:
+        df = read_bank_csv(bank_path)
+    arrays = {
+        "signature": np.asarray(sig, dtype=np.int64),
+        "columns": np.asarray(list(df.columns), dtype=str),
+    }
+    kinds = []
+    for i, c in enumerate(df.columns):
+        col = df[c]
+        if str(col.dtype) == "category":
+            kinds.append("category")
+            arrays[f"codes_{i}"] = col.cat.codes.to_numpy(dtype=np.int32)
+            arrays[f"values_{i}"], arrays[f"ends_{i}"] = _pack_text(col.cat.categories)
+        elif col.dtype.kind == "f":
+            kinds.append("float")
+            arrays[f"values_{i}"] = col.to_numpy(dtype=np.float64)
+        else:
+            kinds.append("text")
+            arrays[f"values_{i}"], arrays[f"ends_{i}"] = _pack_text(col)
+    arrays["kinds"] = np.asarray(kinds, dtype=str)
+    out = sidecar_path(bank_path)
+    tmp = f"{out}.{os.getpid()}.tmp.npz"
+    np.savez(tmp, **arrays)
+    os.replace(tmp, out)
+    return out
+
+def _read_sidecar(bank_path: str, sig: Tuple[int, int]) -> Optional["pd.DataFrame"]:
+    """The sidecar's frame when it exists and matches `sig`; None on any problem."""
+    import numpy as np
+    import pandas as pd
+
+    try:
+        with np.load(sidecar_path(bank_path), allow_pickle=False) as z:
+            if tuple(int(x) for x in z["signature"]) != sig:
+                return None
+            data = {}
+            for i, (c, kind) in enumerate(zip(z["columns"].tolist(), z["kinds"].tolist())):
+                if kind == "float":
+                    data[c] = z[f"values_{i}"].astype(np.float64)
+                    continue
+                values = _unpack_text(z[f"values_{i}"], z[f"ends_{i}"])
+                if kind == "category":
+                    data[c] = pd.Categorical.from_codes(z[f"codes_{i}"], categories=values)
+                else:
+                    data[c] = pd.Series(values, dtype=str)
+            return pd.DataFrame(data)
+    except Exception:
+        return None
+
+def load_bank(bank_path: str, write_sidecar: bool = False) -> "pd.DataFrame":
+    """
+    Return the experience bank at `bank_path`, parsed at most once per file version.
+
+    Frames are cached process-wide by absolute path and (mtime, size), so every caller in a
+    realign request (and across requests) shares one parse until the CSV changes. On a cache
+    miss a fresh compiled sidecar is used when present; otherwise the CSV is parsed and, with
+    `write_sidecar=True`, the sidecar is (re)written for the next cold start.
+
+    The returned frame is shared: treat it as read-only (copy before mutating).
+    """
+    key = os.path.abspath(bank_path)
+    sig = _signature(key)
+    with _bank_lock:
+        hit = _bank_cache.get(key)
+    if hit is not None and hit[0] == sig:
+        return hit[1]
+
+    with stage("bank_load"):
+        df = _read_sidecar(key, sig)
+        if df is None:
+            df = read_bank_csv(key)
+            if write_sidecar:
+                compile_bank(key, df)
+    inc("bank_rows_loaded", len(df))
+
+    with _bank_lock:
+        _bank_cache[key] = (sig, df)
+    return df
+
+def clear_bank_cache() -> None:
+    """Forget every cached bank (e.g. in tests)."""
+    with _bank_lock:
+        _bank_cache.clear()
@@ -0,0 +1,327 @@
+"""
+Offline bulk alignment: score one experience bank against a directory of JDs.
+
+    python -m src.tools.bulk_align jds/ --bank experience_bank.csv --out results.jsonl
+    python -m src.tools.bulk_align jds/ --bank bank.csv --resume base.txt --processes 8
+    python -m src.tools.bulk_align jds/ --bank bank.csv --out results/ --format parquet
+
+Every `*.json` file in the directory is one JD: {"jd_phrases": [...], "jd_atomic": [...],
+"jd_synonyms": {...}} (or {"must_terms": [...], "synonyms": {...}}), optional "title".
+Per JD the variant map is built, the bank bullets hitting the most JD terms are selected
+(at most --per-role per role, --max-bullets overall) and the base resume plus that
+selection is scored with `compute_metrics`.
+
+Results are written as they complete, in JD file order: one line per JD for JSONL, or
+part files of --flush-every rows in a Parquet directory (needs pyarrow). A JD file that
+cannot be parsed gets an {"jd", "error"} record. Re-running with the same --out resumes:
+JDs already present in the output (errors included) are skipped.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from src.common.variants import canonical_variant_map, warm_variant_cache
+from src.tools.bank import load_bank
+from src.tools.relevance import load_relevance_index
+from src.tools.role_index import load_role_index
+from src.tools.scoring import _tokenize, compute_metrics, get_jd_profile
+from src.tools.term_index import load_term_index
+
+def _build_variants():
+    """`build_canonical_variants` from the API module, when it is importable."""
+    try:
+        from src.api.main import build_canonical_variants
+    except ImportError:
+        return None
+    return build_canonical_variants
+
+def jd_terms(jd: Dict) -> Tuple[List[str], Dict[str, List[str]]]:
+    """(must_terms, synonyms map) of one JD file, variants expanded."""
+    if "must_terms" in jd:
+        terms = list(jd.get("must_terms") or [])
+        return terms, canonical_variant_map(terms, jd.get("synonyms"))
+    phrases = list(jd.get("jd_phrases") or [])
+    atomic = list(jd.get("jd_atomic") or [])
+    synonyms = jd.get("jd_synonyms") or {}
+    build = _build_variants()
+    if build is None:
+        return phrases + atomic, canonical_variant_map(phrases + atomic, synonyms)
+    var = build(phrases, atomic, synonyms)
+    merged = dict(var.get("phrase_map") or {})
+    merged.update(var.get("atomic_map") or {})
+    return phrases + atomic, merged
+
+def select_bullets(
+    bank_path: str,
+    must_terms: List[str],
+    synonyms: Dict[str, List[str]],
+    max_bullets: int = 12,
+    per_role: int = 4,
+    min_matches: int = 1,
+) -> List[Dict]:
+    """
+    Bank bullets for one JD, best first: most distinct JD terms, then most hits, then TF-IDF
+    relevance to the JD, then the bank's composite score; duplicates (normalized text) and
+    bullets beyond `per_role` in one role are skipped.
+    """
+    profile = get_jd_profile(must_terms, synonyms)
+    index = load_term_index(bank_path)
+    roles = load_role_index(bank_path)
+    hits = index.bullets_with_min_matches(dict(profile.terms), min_matches=min_matches)
+    relevance = load_relevance_index(bank_path).jd_scores(must_terms, synonyms)
+    ranked = sorted(
+        hits, key=lambda i: (-hits[i][0], -hits[i][1], -relevance[i], -roles.scores[i], i)
+    )
+
+    picked: List[Dict] = []
+    seen: Set[str] = set()
+    per: Dict[tuple, int] = {}
+    for i in ranked:
+        if len(picked) >= max_bullets:
+            break
+        norm = _tokenize(index.bullets[i])
+        role = roles.roles[i]
+        if norm in seen or per.get(role, 0) >= per_role:
+            continue
+        seen.add(norm)
+        per[role] = per.get(role, 0) + 1
+        picked.append({"bullet": index.bullets[i], "role": list(role), "terms_hit": hits[i][0]})
+    return picked
+
+# Worker-side job settings (set once per worker process)
+_worker_opts: Optional[Dict] = None
+
+def _init_worker(opts: Dict) -> None:
+    """Load the bank and its indexes once per worker (a cache hit for forked workers)."""
+    global _worker_opts
+    _worker_opts = opts
+    warm_variant_cache()
+    load_term_index(opts["bank_path"])
+    load_role_index(opts["bank_path"])
+    load_relevance_index(opts["bank_path"])
+
+def align_jd(path: str) -> Dict:
+    """
+    Select and score bank bullets for the JD file at `path` (runs in a worker). A JD that
+    cannot be read or aligned gives {"jd", "error"} instead of raising, so one bad file
+    neither aborts the run nor blocks resuming past it.
+    """
+    started = time.perf_counter()
+    try:
+        return _align_jd(path, _worker_opts, started)
+    except Exception as e:
+        return {
+            "jd": os.path.basename(path),
+            "error": f"{type(e).__name__}: {e}",
+            "seconds": round(time.perf_counter() - started, 6),
+        }
+
+def _align_jd(path: str, opts: Dict, started: float) -> Dict:
+    with open(path, encoding="utf-8") as f:
+        jd = json.load(f)
+    must_terms, synonyms = jd_terms(jd)
+    selected = select_bullets(
+        opts["bank_path"], must_terms, synonyms,
+        max_bullets=opts["max_bullets"], per_role=opts["per_role"],
+    )
+    resume = opts["resume_text"]
+    if selected:
+        resume += "\nEXPERIENCE\n" + "\n".join(f"- {s['bullet']}" for s in selected)
+    report = compute_metrics(resume, must_terms, synonyms, density_target=opts["density_target"])
+    record = {
+        "jd": os.path.basename(path),
+        "title": jd.get("title", ""),
+        "coverage": report["coverage"],
+        "placement_ratio": report["placement_ratio"],
+        "missing_terms": report["missing_terms"],
+        "low_density_terms": [r["term"] for r in report["low_density_terms"]],
+        "selected": selected,
+        "seconds": round(time.perf_counter() - started, 6),
+    }
+    if opts["resume_text"]:
+        base = compute_metrics(opts["resume_text"], must_terms, synonyms,
+                               density_target=opts["density_target"])
+        record["base_coverage"] = base["coverage"]
+        record["base_placement_ratio"] = base["placement_ratio"]
+    return record
+
+def iter_results(paths: List[str], opts: Dict, processes: Optional[int] = None) -> Iterator[Dict]:
+    """`align_jd` over `paths` in order; with `processes` > 1 in a pool, bounded in flight."""
+    if not processes or processes <= 1:
+        _init_worker(opts)
+        for p in paths:
+            yield align_jd(p)
+        return
+    with ProcessPoolExecutor(
+        max_workers=processes, initializer=_init_worker, initargs=(opts,)
+    ) as pool:
+        pending = deque()
+        it = iter(paths)
+        while True:
+            while len(pending) < processes * 2:
+                p = next(it, None)
+                if p is None:
+                    break
+                pending.append(pool.submit(align_jd, p))
+            if not pending:
+                break
+            yield pending.popleft().result()
+
+class JsonlSink:
+    """Append-only JSONL output; the file itself is the checkpoint."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.done = self._completed()
+        self._f = open(path, "a", encoding="utf-8")
+
+    def _completed(self) -> Set[str]:
+        done: Set[str] = set()
+        if not os.path.exists(self.path):
+            return done
+        with open(self.path, "rb+") as f:
+            data = f.read()
+            # drop a line cut short by an interrupted run
+            end = data.rfind(b"\n") + 1
+            if end < len(data):
+                f.truncate(end)
+        for line in data[:end].splitlines():
+            if line.strip():
+                done.add(json.loads(line)["jd"])
+        return done
+
+    def write(self, record: Dict) -> None:
+        self._f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._f.flush()
+
+    def close(self) -> None:
+        self._f.close()
+
+class ParquetSink:
+    """
+    Parquet dataset directory of part files; each part is renamed into place only once
+    complete, so the parts on disk are the checkpoint. List fields are stored as JSON text.
+    """
+
+    _JSON_FIELDS = ("missing_terms", "low_density_terms", "selected")
+
+    def __init__(self, path: str, flush_every: int = 50):
+        import pyarrow.parquet as pq
+
+        self._pq = pq
+        self.path = path
+        self.flush_every = flush_every
+        os.makedirs(path, exist_ok=True)
+        self._parts = sorted(n for n in os.listdir(path) if n.endswith(".parquet"))
+        self.done: Set[str] = set()
+        for name in self._parts:
+            self.done.update(pq.read_table(os.path.join(path, name), columns=["jd"])["jd"].to_pylist())
+        self._rows: List[Dict] = []
+
+    def write(self, record: Dict) -> None:
+        row = dict(record)
+        for k in self._JSON_FIELDS:
+            row[k] = json.dumps(row.get(k), ensure_ascii=False)
+        self._rows.append(row)
+        if len(self._rows) >= self.flush_every:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._rows:
+            return
+        import pyarrow as pa
+
+        # error records lack most fields (and ok ones lack "error"): align every row's columns
+        columns = list(dict.fromkeys(k for row in self._rows for k in row))
+        rows = [{k: row.get(k) for k in columns} for row in self._rows]
+        name = f"part-{len(self._parts):05d}.parquet"
+        final = os.path.join(self.path, name)
+        tmp = f"{final}.{os.getpid()}.tmp"
+        self._pq.write_table(pa.Table.from_pylist(rows), tmp)
+        os.replace(tmp, final)
+        self._parts.append(name)
+        self._rows = []
+
+    def close(self) -> None:
+        self._flush()
+
+def run(
+    jd_dir: str,
+    bank_path: str,
+    out: str,
+    fmt: str = "jsonl",
+    resume_path: Optional[str] = None,
+    processes: Optional[int] = None,
+    max_bullets: int = 12,
+    per_role: int = 4,
+    density_target: int = 2,
+    flush_every: int = 50,
+) -> Dict[str, int]:
+    """
+    Align every JD in `jd_dir` not yet in `out`; returns {"total", "skipped", "written",
+    "failed"} (failed JDs are written as error records, so they count as done).
+    """
+    paths = sorted(
+        e.path for e in os.scandir(jd_dir) if e.is_file() and e.name.endswith(".json")
+    )
+    sink = ParquetSink(out, flush_every) if fmt == "parquet" else JsonlSink(out)
+    todo = [p for p in paths if os.path.basename(p) not in sink.done]
+
+    # Parse the bank (and write its sidecar) before forking so workers share the pages
+    load_bank(bank_path, write_sidecar=True)
+    load_term_index(bank_path)
+    load_role_index(bank_path)
+    load_relevance_index(bank_path)
+    resume_text = ""
+    if resume_path:
+        with open(resume_path, encoding="utf-8") as f:
+            resume_text = f.read()
+    opts = {
+        "bank_path": os.path.abspath(bank_path),
+        "resume_text": resume_text,
+        "max_bullets": max_bullets,
+        "per_role": per_role,
+        "density_target": density_target,
+    }
+    written = failed = 0
+    try:
+        for record in iter_results(todo, opts, processes):
+            sink.write(record)
+            written += 1
+            failed += "error" in record
+    finally:
+        sink.close()
+    return {"total": len(paths), "skipped": len(paths) - len(todo), "written": written,
+            "failed": failed}
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Score a directory of JDs against an experience bank.")
+    ap.add_argument("jd_dir")
+    ap.add_argument("--bank", required=True, help="experience bank CSV")
+    ap.add_argument("--out", default="bulk_results.jsonl", help="JSONL file or Parquet directory")
+    ap.add_argument("--format", choices=["jsonl", "parquet"], default=None,
+                    help="default: jsonl for a *.jsonl --out, parquet otherwise")
+    ap.add_argument("--resume", default=None, help="base resume text the selection is added to")
+    ap.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--max-bullets", type=int, default=12)
+    ap.add_argument("--per-role", type=int, default=4)
+    ap.add_argument("--density-target", type=int, default=int(os.getenv("DENSITY_TARGET", "2")))
+    ap.add_argument("--flush-every", type=int, default=50, help="rows per Parquet part file")
+    args = ap.parse_args(argv)
+
+    fmt = args.format or ("jsonl" if args.out.endswith(".jsonl") else "parquet")
+    stats = run(
+        args.jd_dir, args.bank, args.out, fmt=fmt, resume_path=args.resume,
+        processes=args.processes, max_bullets=args.max_bullets, per_role=args.per_role,
+        density_target=args.density_target, flush_every=args.flush_every,
+    )
+    print(json.dumps(stats), file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+import numpy as np
+from typing import List, Dict, Sequence, Tuple
+
+from src.tools.scoring import JDProfile, _VariantMatcher, _tally, get_jd_profile, parse_sections
+
+class CoverageMatrix:
+    """
+    Alignment of N resumes against M JDs, as dense N x M arrays:
+
+    - coverage: share of each JD's must-have terms found in each resume
+    - placement_ratio: share of each JD's must-have terms found inside EXPERIENCE
+    - missing_count: number of must-have terms with zero density
+    - low_density_count: number of must-have terms with 0 < density < density_target
+
+    `pair(i, j)` returns the full `compute_metrics` report for one resume/JD pair.
+    """
+
+    def __init__(
+        self,
+        resumes: List[str],
+        profiles: List[JDProfile],
+        density_target: int,
+        coverage: np.ndarray,
+        placement_ratio: np.ndarray,
+        missing_count: np.ndarray,
+        low_density_count: np.ndarray,
+    ):
+        self.resumes = resumes
+        self.profiles = profiles
+        self.density_target = density_target
+        self.coverage = coverage
+        self.placement_ratio = placement_ratio
+        self.missing_count = missing_count
+        self.low_density_count = low_density_count
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.coverage.shape
+
+    def pair(self, i: int, j: int) -> Dict:
+        """Per-term drill-down for resume `i` against JD `j` (same dict as `compute_metrics`)."""
+        return self.profiles[j].score(self.resumes[i], self.density_target)
+
+def _term_counts(
+    rows: np.ndarray,
+    cols: np.ndarray,
+    data: np.ndarray,
+    var_ptr: np.ndarray,
+    var_terms: np.ndarray,
+    n_rows: int,
+    n_terms: int,
+) -> np.ndarray:
+    """
+    Sparse (resume, variant) counts -> dense (resume, term) counts for one JD.
+
+    `var_ptr`/`var_terms` is a CSR map from global variant column to the JD's term indices
+    (a variant can belong to several terms, or to none of this JD's terms).
+    """
+    out = np.zeros((n_rows, n_terms), dtype=np.int64)
+    deg = var_ptr[cols + 1] - var_ptr[cols]
+    keep = deg > 0
+    rows, cols, data, deg = rows[keep], cols[keep], data[keep], deg[keep]
+    if not len(rows):
+        return out
+    # Expand every nonzero once per term its variant belongs to
+    first = np.repeat(var_ptr[cols], deg)
+    within = np.arange(int(deg.sum())) - np.repeat(np.cumsum(deg) - deg, deg)
+    np.add.at(out, (np.repeat(rows, deg), var_terms[first + within]), np.repeat(data, deg))
+    return out
+
+def compute_coverage_matrix(
+    resumes: Sequence[str],
+    jds: Sequence[Tuple[List[str], Dict[str, List[str]]]],
+    density_target: int = 2,
+) -> CoverageMatrix:
+    """
+    Score every resume against every JD (`jds` is a list of `(must_terms, synonyms)` pairs).
+
+    Each resume is segmented and scanned once with a matcher over the union of all JDs'
+    variants, giving sparse per-variant count and EXPERIENCE-hit vectors. Per JD, those are
+    folded into term counts with vectorized ops, so the cost is one pass per resume plus
+    array work, instead of N x M `compute_metrics` calls. The results agree with
+    `compute_metrics` for every pair.
+    """
+    resumes = list(resumes)
+    profiles = [get_jd_profile(terms, syns) for terms, syns in jds]
+
+    vocab: Dict[str, int] = {}
+    for profile in profiles:
+        for _, vlist in profile.terms:
+            for v in vlist:
+                if v:
+                    vocab.setdefault(v, len(vocab))
+    matcher = _VariantMatcher(list(vocab))
+
+    # Sparse resume x variant matrices in COO form: counts, and "hit inside EXPERIENCE"
+    rows, cols, data = [], [], []
+    exp_rows, exp_cols = [], []
+    for i, text in enumerate(resumes):
+        text_full, sections = parse_sections(text)
+        counts, placed = _tally(matcher.scan(text_full), sections)
+        for v, n in counts.items():
+            rows.append(i); cols.append(vocab[v]); data.append(n)
+        for v, names in placed.items():
+            if "EXPERIENCE" in names:
+                exp_rows.append(i); exp_cols.append(vocab[v])
+
+    rows, cols, data = (np.asarray(a, dtype=np.int64) for a in (rows, cols, data))
+    exp_rows, exp_cols = (np.asarray(a, dtype=np.int64) for a in (exp_rows, exp_cols))
+    exp_data = np.ones(len(exp_rows), dtype=np.int64)
+
+    n, m = len(resumes), len(profiles)
+    coverage = np.zeros((n, m))
+    placement_ratio = np.zeros((n, m))
+    missing_count = np.zeros((n, m), dtype=np.int64)
+    low_density_count = np.zeros((n, m), dtype=np.int64)
+
+    for j, profile in enumerate(profiles):
+        # CSR map variant column -> this JD's term indices
+        edges = sorted(
+            (vocab[v], t) for t, (_, vlist) in enumerate(profile.terms) for v in vlist if v
+        )
+        var_ptr = np.zeros(len(vocab) + 1, dtype=np.int64)
+        np.add.at(var_ptr, np.asarray([c + 1 for c, _ in edges], dtype=np.int64), 1)
+        var_ptr = np.cumsum(var_ptr)
+        var_terms = np.asarray([t for _, t in edges], dtype=np.int64)
+
+        n_terms = len(profile.terms)
+        dens = _term_counts(rows, cols, data, var_ptr, var_terms, n, n_terms)
+        in_exp = _term_counts(exp_rows, exp_cols, exp_data, var_ptr, var_terms, n, n_terms) > 0
+
+        if profile.n_terms:
+            coverage[:, j] = (dens > 0).sum(axis=1) / profile.n_terms
+            placement_ratio[:, j] = in_exp.sum(axis=1) / profile.n_terms
+        missing_count[:, j] = (dens == 0).sum(axis=1)
+        low_density_count[:, j] = ((dens > 0) & (dens < density_target)).sum(axis=1)
+
+    return CoverageMatrix(
+        resumes, profiles, density_target,
+        coverage, placement_ratio, missing_count, low_density_count,
+    )
@@ -0,0 +1,245 @@
+import asyncio
+import time
+from concurrent.futures import Executor
+from typing import List, Dict, Optional, Sequence
+
+from src.common.executors import run_cpu
+from src.common.metrics import inc, timed
+from src.tools.feasibility import COVERAGE_TARGET, DENSITY_TARGET, PLACEMENT_TARGET
+from src.tools.promotions import evaluate_bank_swaps
+from src.tools.role_index import load_role_index
+from src.tools.scoring import _tokenize, compute_metrics, get_jd_profile
+from src.tools.term_index import load_term_index
+
+# Objective weights for picking among drafts; every extra bullet costs `length_weight`
+DRAFT_WEIGHTS = {"coverage": 1.0, "placement": 0.5, "density": 0.5, "length": 0.01}
+
+def render_draft(base_text: str, bullets: Sequence[str]) -> str:
+    """Resume text of a draft: the fixed sections plus the draft's EXPERIENCE bullets."""
+    experience = "EXPERIENCE\n" + "".join(f"- {b}\n" for b in bullets)
+    return f"{base_text.rstrip()}\n{experience}" if base_text.strip() else experience
+
+def _apply_promotions(bullets: List[str], promotions: Sequence[Dict]) -> List[str]:
+    swap = {_tokenize(p["from_bullet"]): p["to_bullet"] for p in promotions}
+    return [swap.get(_tokenize(b), b) for b in bullets]
+
+def _backfill(bullets: List[str], depth: int, roles, hits: Dict[int, int]) -> List[str]:
+    """Add up to `depth` JD-relevant bank bullets per role, right after that role's bullets."""
+    if depth <= 0:
+        return list(bullets)
+    role_of = [roles.role_for(b) for b in bullets]
+    last = {r: k for k, r in enumerate(role_of) if r is not None}
+    extra: Dict[int, List[str]] = {}
+    for role, at in last.items():
+        ids = roles.top_k(role, depth, exclude=bullets, key=lambda i: hits.get(i, 0))
+        extra[at] = [roles.bullets[i] for i in ids if hits.get(i, 0) > 0]
+    out: List[str] = []
+    for k, b in enumerate(bullets):
+        out.append(b)
+        out.extend(extra.get(k, ()))
+    return out
+
+@timed("drafts_build")
+def build_drafts(
+    selected_bullets: Sequence[str],
+    must_terms: List[str],
+    synonyms: Dict[str, List[str]],
+    bank_path: str,
+    density_target: int = DENSITY_TARGET,
+    max_promotions: int = 3,
+    backfill_depths: Sequence[int] = (0, 1, 2),
+    max_drafts: int = 12,
+    current_density: Optional[Sequence[int]] = None,
+) -> List[Dict]:
+    """
+    Candidate drafts for one realign iteration, without scoring them.
+
+    Promotions come from `evaluate_bank_swaps` (best first, non-conflicting); every prefix
+    of that list and every single promotion is a promotion subset. Each subset is combined
+    with every backfill depth: the top-`depth` bank bullets per selected role that hit JD
+    terms (role index ranked by JD term hits). The unchanged selection is never a draft.
+
+    Returns up to `max_drafts` dicts {"label", "bullets", "promotions", "backfill"}.
+    """
+    selected = list(selected_bullets)
+    swaps = evaluate_bank_swaps(
+        selected, must_terms, synonyms, bank_path,
+        density_target=density_target, max_promotions=max_promotions,
+        current_density=current_density,
+    )["promotions"]
+    subsets = [swaps[:k] for k in range(len(swaps), -1, -1)]       # largest first, then none
+    subsets += [[p] for p in swaps[1:]]
+    roles = load_role_index(bank_path)
+    hits = {
+        i: n for i, (n, _) in load_term_index(bank_path).bullets_with_min_matches(
+            dict(get_jd_profile(must_terms, synonyms).terms), min_matches=1
+        ).items()
+    }
+
+    drafts: List[Dict] = []
+    seen = {tuple(_tokenize(b) for b in selected)}
+    for subset in subsets:
+        promoted = _apply_promotions(selected, subset)
+        kept = set(promoted)
+        for depth in backfill_depths:
+            bullets = _backfill(promoted, depth, roles, hits)
+            key = tuple(_tokenize(b) for b in bullets)
+            if key in seen:
+                continue
+            seen.add(key)
+            drafts.append({
+                "label": f"promote{len(subset)}"
+                         + (f"[{swaps.index(subset[0])}]" if len(subset) == 1 else "")
+                         + f"+backfill{depth}",
+                "bullets": bullets,
+                "promotions": subset,
+                "backfill": [b for b in bullets if b not in kept],
+            })
+            if len(drafts) >= max_drafts:
+                return drafts
+    return drafts
+
+def draft_objective(report: Dict, n_bullets: int = 0, density_target: int = DENSITY_TARGET,
+                    weights: Optional[Dict[str, float]] = None) -> float:
+    """
+    Coverage / density / placement objective of a scored draft (higher is better):
+    weighted coverage + placement ratio + mean capped density share, minus a small cost
+    per bullet so that equally good drafts prefer the shorter resume.
+    """
+    w = DRAFT_WEIGHTS if weights is None else weights
+    results = report["term_results"]
+    density = (
+        sum(min(r["density"], density_target) for r in results) / (density_target * len(results))
+        if results and density_target > 0 else 0.0
+    )
+    return (
+        w["coverage"] * report["coverage"]
+        + w["placement"] * report["placement_ratio"]
+        + w["density"] * density
+        - w["length"] * n_bullets
+    )
+
+def targets_met(report: Dict, coverage_target: float = COVERAGE_TARGET,
+                placement_target: float = PLACEMENT_TARGET) -> bool:
+    return (
+        report["coverage"] >= coverage_target
+        and report["placement_ratio"] >= placement_target
+        and not report["low_density_terms"]
+    )
+
+def _score_draft(text: str, must_terms: List[str], synonyms: Dict[str, List[str]],
+                 density_target: int) -> Dict:
+    return compute_metrics(text, must_terms, synonyms, density_target=density_target)
+
+def score_drafts(
+    drafts: Sequence[Dict],
+    base_text: str,
+    must_terms: List[str],
+    synonyms: Dict[str, List[str]],
+    density_target: int = DENSITY_TARGET,
+    executor: Optional[Executor] = None,
+) -> List[Dict]:
+    """
+    Score every draft (in `executor` when given, e.g. a process pool, else inline); returns
+    the drafts with "report" and "objective" added, in input order.
+    """
+    texts = [render_draft(base_text, d["bullets"]) for d in drafts]
+    args = (must_terms, synonyms, density_target)
+    if executor is None or len(texts) < 2:
+        reports = [_score_draft(t, *args) for t in texts]
+    else:
+        reports = list(executor.map(_score_draft, texts, *[[a] * len(texts) for a in args]))
+    inc("drafts_scored", len(reports))
+    return [
+        dict(d, report=r, objective=draft_objective(r, len(d["bullets"]), density_target))
+        for d, r in zip(drafts, reports)
+    ]
+
+async def ascore_drafts(
+    drafts: Sequence[Dict],
+    base_text: str,
+    must_terms: List[str],
+    synonyms: Dict[str, List[str]],
+    density_target: int = DENSITY_TARGET,
+) -> List[Dict]:
+    """`score_drafts` for async handlers: all drafts are scored concurrently in the CPU pool."""
+    reports = await asyncio.gather(*(
+        run_cpu(_score_draft, render_draft(base_text, d["bullets"]), must_terms, synonyms, density_target)
+        for d in drafts
+    ))
+    inc("drafts_scored", len(reports))
+    return [
+        dict(d, report=r, objective=draft_objective(r, len(d["bullets"]), density_target))
+        for d, r in zip(drafts, reports)
+    ]
+
+def _best(scored: Sequence[Dict], coverage_target: float, placement_target: float) -> Dict:
+    """Drafts that meet every target win; otherwise (and among those) the best objective."""
+    return max(scored, key=lambda d: (
+        targets_met(d["report"], coverage_target, placement_target), d["objective"]
+    ))
+
+def speculative_realign(
+    selected_bullets: Sequence[str],
+    base_text: str,
+    must_terms: List[str],
+    synonyms: Dict[str, List[str]],
+    bank_path: str,
+    coverage_target: float = COVERAGE_TARGET,
+    density_target: int = DENSITY_TARGET,
+    placement_target: float = PLACEMENT_TARGET,
+    max_iterations: int = 3,
+    executor: Optional[Executor] = None,
+    **draft_options,
+) -> Dict:
+    """
+    Realign by exploring several drafts per iteration and keeping the best one.
+
+    Each iteration builds drafts (`build_drafts`: promotion subsets x backfill depths),
+    scores them all concurrently (`score_drafts`) and moves to the best draft when it
+    beats the current objective. Stops when the targets are met, nothing improves, or after
+    `max_iterations`. `base_text` is the resume outside EXPERIENCE; the selection is its
+    EXPERIENCE bullets.
+
+    Returns {"bullets", "report", "objective", "iterations", "reason", "history"} with
+    reason "targets_met" | "no_improvement" | "max_iterations"; history has one entry per
+    iteration (drafts tried, label and objective of the best, seconds).
+    """
+    bullets = list(selected_bullets)
+    report = _score_draft(render_draft(base_text, bullets), must_terms, synonyms, density_target)
+    objective = draft_objective(report, len(bullets), density_target)
+    history: List[Dict] = []
+    iteration, reason = 0, "max_iterations"
+    while not targets_met(report, coverage_target, placement_target):
+        if iteration >= max_iterations:
+            break
+        iteration += 1
+        started = time.perf_counter()
+        drafts = build_drafts(bullets, must_terms, synonyms, bank_path,
+                              density_target=density_target, **draft_options)
+        scored = score_drafts(drafts, base_text, must_terms, synonyms, density_target, executor)
+        best = _best(scored, coverage_target, placement_target) if scored else None
+        history.append({
+            "iteration": iteration,
+            "drafts": len(scored),
+            "best": best["label"] if best else None,
+            "objective": best["objective"] if best else None,
+            "seconds": time.perf_counter() - started,
+        })
+        if best is None or (
+            best["objective"] <= objective
+            and not targets_met(best["report"], coverage_target, placement_target)
+        ):
+            reason = "no_improvement"
+            break
+        bullets, report, objective = best["bullets"], best["report"], best["objective"]
+    else:
+        reason = "targets_met"
+    return {
+        "bullets": bullets,
+        "report": report,
+        "objective": objective,
+        "iterations": iteration,
+        "reason": reason,
+        "history": history,
+    }
@@ -0,0 +1,38 @@
+"""
+Local stand-in for the OpenAI chat completions API, for load tests.
+
+    FAKE_LLM_LATENCY_MS=800 uvicorn src.tools.fake_llm:app --port 8001
+    OPENAI_BASE_URL=http://127.0.0.1:8001/v1 OPENAI_API_KEY=fake uvicorn src.api.main:app
+
+Responses echo the last user message after a fixed delay, so endpoint concurrency can be
+measured without network calls or token spend.
+"""
+import asyncio
+import os
+import time
+import uuid
+
+from fastapi import FastAPI, Request
+
+FAKE_LLM_LATENCY_MS = float(os.getenv("FAKE_LLM_LATENCY_MS", "500"))
+
+app = FastAPI(title="fake-llm")
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    await asyncio.sleep(FAKE_LLM_LATENCY_MS / 1000)
+    user = [m for m in body.get("messages", []) if m.get("role") == "user"]
+    content = str(user[-1].get("content", "")) if user else ""
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "fake"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+    }
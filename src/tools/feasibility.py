@@ -0,0 +1,82 @@
+import os
+from typing import List, Dict, Optional
+
+from src.tools.scoring import compute_metrics, get_jd_profile
+from src.tools.term_index import load_term_index
+
+# Same knobs (and defaults) as the realign loop in .env
+COVERAGE_TARGET = float(os.getenv("COVERAGE_TARGET", "0.95"))
+DENSITY_TARGET = int(os.getenv("DENSITY_TARGET", "2"))
+PLACEMENT_TARGET = float(os.getenv("PLACEMENT_TARGET", "0.7"))
+
+def realign_feasibility(
+    resume_text: str,
+    must_terms: List[str],
+    synonyms: Dict[str, List[str]],
+    bank_path: str,
+    coverage_target: float = COVERAGE_TARGET,
+    density_target: int = DENSITY_TARGET,
+    placement_target: float = PLACEMENT_TARGET,
+    report: Optional[Dict] = None,
+) -> Dict:
+    """
+    Upper bound on what realign can reach for this JD, to decide whether to iterate at all.
+
+    Per term, the best case is the current resume plus every bank bullet that mentions it
+    (from the cached bank term index): its density can reach at most current + bank hits,
+    and it is placeable in EXPERIENCE if it is already there or any bank bullet has it
+    (bank bullets go into EXPERIENCE). A missing term only counts as coverable when it can
+    reach the density target, since adding it below target makes it a low-density term;
+    otherwise it can stay missing and counts against max_coverage. A term already present
+    below target that the bank cannot lift is a density blocker. These bounds are
+    optimistic, so "unreachable" is definite while "reachable" only means "not ruled out".
+
+    Returns:
+    - should_iterate: False when the targets are already met or cannot be met
+    - reason: "targets_met" | "unreachable" | "reachable"
+    - max_coverage / max_placement_ratio: the upper bounds
+    - unreachable_terms: {"coverage": [...], "density": [...], "placement": [...]}, terms
+      that no promotion or backfill from this bank can fix
+    - report: the current `compute_metrics` report (reused when passed in)
+    """
+    if report is None:
+        report = compute_metrics(resume_text, must_terms, synonyms, density_target=density_target)
+    profile = get_jd_profile(must_terms, synonyms)
+    index = load_term_index(bank_path)
+
+    n = profile.n_terms
+    never_covered, never_dense, never_placed = [], [], []
+    for r, (_, vlist) in zip(report["term_results"], profile.terms):
+        bank_hits = sum(index.term_postings(vlist).values())
+        best = r["density"] + bank_hits
+        if best == 0 or best < density_target:
+            (never_dense if r["density"] > 0 else never_covered).append(r["term"])
+        if not r["in_experience"] and bank_hits == 0:
+            never_placed.append(r["term"])
+
+    max_coverage = ((n - len(never_covered)) / n) if n else 0.0
+    max_placement = ((n - len(never_placed)) / n) if n else 0.0
+
+    if (
+        report["coverage"] >= coverage_target
+        and report["placement_ratio"] >= placement_target
+        and not report["low_density_terms"]
+    ):
+        reason = "targets_met"
+    elif max_coverage < coverage_target or max_placement < placement_target or never_dense:
+        reason = "unreachable"
+    else:
+        reason = "reachable"
+
+    return {
+        "should_iterate": reason == "reachable",
+        "reason": reason,
+        "max_coverage": max_coverage,
+        "max_placement_ratio": max_placement,
+        "unreachable_terms": {
+            "coverage": never_covered,
+            "density": never_dense,
+            "placement": never_placed,
+        },
+        "report": report,
+    }
@@ -0,0 +1,157 @@
+from typing import List, Dict, Optional
+
+from src.tools.scoring import _section_header, _tally, _tokenize, get_jd_profile
+
+class IncrementalScorer:
+    """
+    Keeps `compute_metrics` state for a resume that is edited bullet by bullet.
+
+    Every bullet (one resume line) is scanned once when added; its per-term counts are kept
+    so that removing or swapping it only touches the terms it hits. Coverage, density and
+    placement_ratio are maintained as running totals, so `add_bullet` / `remove_bullet` /
+    `swap` cost time proportional to the changed bullets, not to the whole resume.
+
+    Notes:
+    - `section` is the section name a bullet sits under (e.g. "EXPERIENCE"); header lines and
+      text before the first header are added with `section=None` (density only).
+    - Matches are confined to one bullet. A full rescore of the joined text could also match
+      a multi-word variant across a line break, which is the only way the two can differ.
+    """
+
+    def __init__(
+        self,
+        must_terms: List[str],
+        synonyms: Dict[str, List[str]],
+        density_target: int = 2,
+    ):
+        self.profile = get_jd_profile(must_terms, synonyms)
+        self.density_target = density_target
+
+        # variant -> indices of the terms it counts towards
+        self._variant_terms: Dict[str, List[int]] = {}
+        for t, (_, vlist) in enumerate(self.profile.terms):
+            for v in vlist:
+                self._variant_terms.setdefault(v, []).append(t)
+
+        n = len(self.profile.terms)
+        self._density = [0] * n
+        self._section_hits: List[Dict[str, int]] = [{} for _ in range(n)]   # bullets per section
+        self._covered = 0
+        self._in_experience = 0
+        self._bullets: Dict[int, tuple] = {}
+        self._next_id = 0
+
+    @classmethod
+    def from_resume(
+        cls,
+        resume_text: str,
+        must_terms: List[str],
+        synonyms: Dict[str, List[str]],
+        density_target: int = 2,
+    ) -> "IncrementalScorer":
+        """Load a full resume, one bullet per non-empty line, using `parse_sections` headers."""
+        scorer = cls(must_terms, synonyms, density_target)
+        section = None
+        for line in resume_text.splitlines():
+            if not line.strip():
+                continue
+            header = _section_header(line)
+            if header is None:
+                scorer.add_bullet(line, section)
+                continue
+            section, inline = header
+            if inline.strip():
+                # "Skills: sql, etl" -> the header words, then the content under SKILLS
+                stripped = line.strip()
+                scorer.add_bullet(stripped[:len(stripped) - len(inline)], None)
+                scorer.add_bullet(inline, section)
+            else:
+                scorer.add_bullet(line, None)
+        return scorer
+
+    def _term_counts(self, text: str) -> Dict[int, int]:
+        counts, _ = _tally(self.profile.matcher.scan(_tokenize(text)))
+        per_term: Dict[int, int] = {}
+        for v, n in counts.items():
+            for t in self._variant_terms.get(v, ()):
+                per_term[t] = per_term.get(t, 0) + n
+        return per_term
+
+    def _apply(self, section: Optional[str], term_counts: Dict[int, int], sign: int) -> None:
+        for t, n in term_counts.items():
+            before = self._density[t]
+            self._density[t] = before + sign * n
+            if (before > 0) != (self._density[t] > 0):
+                self._covered += sign
+            if section is None:
+                continue
+            hits = self._section_hits[t]
+            prev = hits.get(section, 0)
+            hits[section] = prev + sign
+            if not hits[section]:
+                del hits[section]
+            if section == "EXPERIENCE" and (prev > 0) != (prev + sign > 0):
+                self._in_experience += sign
+
+    def add_bullet(self, text: str, section: Optional[str] = "EXPERIENCE") -> int:
+        """Add one bullet under `section`; returns its id."""
+        term_counts = self._term_counts(text)
+        bullet_id = self._next_id
+        self._next_id += 1
+        self._bullets[bullet_id] = (text, section, term_counts)
+        self._apply(section, term_counts, +1)
+        return bullet_id
+
+    def remove_bullet(self, bullet_id: int) -> str:
+        """Remove a bullet by id; returns its text."""
+        text, section, term_counts = self._bullets.pop(bullet_id)
+        self._apply(section, term_counts, -1)
+        return text
+
+    def swap(self, bullet_id: int, new_text: str) -> int:
+        """Replace a bullet's text, keeping its section; returns the new bullet's id."""
+        section = self._bullets[bullet_id][1]
+        self.remove_bullet(bullet_id)
+        return self.add_bullet(new_text, section)
+
+    def bullets(self, section: Optional[str] = None) -> Dict[int, str]:
+        """Current bullets (id -> text), optionally only those under `section`."""
+        return {
+            i: text for i, (text, sec, _) in self._bullets.items()
+            if section is None or sec == section
+        }
+
+    @property
+    def coverage(self) -> float:
+        n = self.profile.n_terms
+        return (self._covered / n) if n else 0.0
+
+    @property
+    def placement_ratio(self) -> float:
+        n = self.profile.n_terms
+        return (self._in_experience / n) if n else 0.0
+
+    def metrics(self) -> Dict:
+        """The current alignment report, in the same shape as `compute_metrics`."""
+        results = []
+        for t, (term, vlist) in enumerate(self.profile.terms):
+            sections = self._section_hits[t]
+            results.append({
+                "term": term,
+                "variants": list(vlist),
+                "density": self._density[t],
+                "in_experience": "EXPERIENCE" in sections,
+                "sections": sorted(sections),
+            })
+
+        return {
+            "coverage": self.coverage,
+            "missing_terms": [r["term"] for r in results if r["density"] == 0],
+            "low_density_terms": [
+                {"term": r["term"], "density": r["density"]}
+                for r in results
+                if 0 < r["density"] < self.density_target
+            ],
+            "placement_ratio": self.placement_ratio,
+            "term_results": results,
+        }
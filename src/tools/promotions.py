@@ -0,0 +1,196 @@
+import time
+from typing import List, Dict, Optional, Sequence
+
+import numpy as np
+
+from src.common.metrics import inc, timed
+from src.tools.role_index import RoleTuple, load_role_index
+from src.tools.scoring import JDProfile, _tally, _tokenize, get_jd_profile
+from src.tools.term_index import load_term_index
+
+def term_count_matrix(profile: JDProfile, bullets: Sequence[str]) -> np.ndarray:
+    """(len(bullets), n_terms) matrix of per-bullet term densities, `compute_metrics` semantics."""
+    col: Dict[str, List[int]] = {}
+    for t, (_, vlist) in enumerate(profile.terms):
+        for v in vlist:
+            col.setdefault(v, []).append(t)
+    out = np.zeros((len(bullets), len(profile.terms)), dtype=np.int32)
+    for i, b in enumerate(bullets):
+        counts, _ = _tally(profile.matcher.scan(_tokenize(b)))
+        for v, n in counts.items():
+            for t in col.get(v, ()):
+                out[i, t] += n
+    return out
+
+def _term_objective(d: np.ndarray, density_target: int, coverage_weight: float,
+                    density_weight: float) -> np.ndarray:
+    """Per-term coverage + capped density of term densities (elementwise)."""
+    return coverage_weight * (d > 0) + density_weight * np.minimum(d, density_target)
+
+def _objective(d: np.ndarray, density_target: int, coverage_weight: float, density_weight: float):
+    """Coverage + capped density of term-density vectors (last axis = terms)."""
+    return _term_objective(d, density_target, coverage_weight, density_weight).sum(axis=-1)
+
+@timed("promotions")
+def evaluate_swaps(
+    selected_bullets: Sequence[str],
+    candidate_bullets: Sequence[str],
+    must_terms: List[str],
+    synonyms: Dict[str, List[str]],
+    density_target: int = 2,
+    max_promotions: int = 3,
+    current_density: Optional[Sequence[int]] = None,
+    selected_roles: Optional[Sequence[Optional[RoleTuple]]] = None,
+    candidate_roles: Optional[Sequence[Optional[RoleTuple]]] = None,
+    same_role_bonus: float = 0.25,
+    coverage_weight: float = 1.0,
+    density_weight: float = 0.5,
+    candidate_counts: Optional[np.ndarray] = None,
+    candidate_norms: Optional[Sequence[str]] = None,
+) -> Dict:
+    """
+    Pick the best non-conflicting (from_bullet -> to_bullet) swaps by vectorized scoring.
+
+    For every selected bullet i and candidate j the resulting term densities are
+    `d - S[i] + C[j]` (S, C = bullet x term count matrices, d = current densities, taken
+    from `current_density` when the resume has other sections, else the selection's sum).
+    `candidate_counts` is C for all of `candidate_bullets` when it is already known (e.g.
+    from bank term postings); otherwise the candidates are scanned. `candidate_norms` are
+    their `_tokenize`d texts, when already known, for excluding bullets already selected.
+    All swaps are scored at once on coverage gain plus capped density gain (the objective
+    is a sum over terms, so only the nonzero cells of C contribute beyond dropping the
+    selected bullet: the work is selected x nnz(C), not selected x candidates x terms), with
+    `same_role_bonus` added to swaps that stay inside one role. Only swaps that improve the
+    term objective are proposed. After each accepted swap the state is updated and the
+    remaining swaps re-scored, so later picks account for earlier ones; no bullet is used
+    twice.
+
+    Returns {"promotions": [...], "stats": {...}}, each promotion shaped like
+    `propose_jd_promotions` output (from_bullet, to_bullet, role_tuple) plus the gain and
+    newly covered terms; stats count the swaps evaluated and the time spent.
+    """
+    started = time.perf_counter()
+    profile = get_jd_profile(must_terms, synonyms)
+    terms = [t for t, _ in profile.terms]
+
+    selected = list(selected_bullets)
+    in_selection = {_tokenize(b) for b in selected}
+    norms = candidate_norms if candidate_norms is not None else map(_tokenize, candidate_bullets)
+    cand_ids = [j for j, b in enumerate(norms) if b not in in_selection]
+    candidates = [candidate_bullets[j] for j in cand_ids]
+
+    S = term_count_matrix(profile, selected)
+    if candidate_counts is None:
+        C = term_count_matrix(profile, candidates)
+    else:
+        C = np.asarray(candidate_counts, dtype=np.int32)[cand_ids]
+    d = S.sum(axis=0)
+    if current_density is not None:
+        d = np.maximum(d, np.asarray(current_density, dtype=d.dtype))
+
+    same_role = np.zeros((len(selected), len(candidates)), dtype=bool)
+    if selected_roles is not None and candidate_roles is not None:
+        codes: Dict[RoleTuple, int] = {}
+        c_codes = np.fromiter(
+            (codes.setdefault(candidate_roles[j], len(codes)) for j in cand_ids),
+            dtype=np.int64, count=len(cand_ids),
+        )
+        for i, r in enumerate(selected_roles):
+            if r is not None and r in codes:
+                same_role[i] = c_codes == codes[r]
+
+    used_from = np.zeros(len(selected), dtype=bool)
+    used_to = np.zeros(len(candidates), dtype=bool)
+    promotions = []
+    evaluated = 0
+    objective = (density_target, coverage_weight, density_weight)
+    nz_rows, nz_terms = np.nonzero(C)
+    nz_counts = C[nz_rows, nz_terms]
+
+    while len(promotions) < max_promotions and len(selected) and len(candidates):
+        base = _objective(d, *objective)
+        removed = d[None, :] - S                      # state after dropping each selected bullet
+        before = removed[:, nz_terms]
+        delta = _term_objective(before + nz_counts, *objective) - _term_objective(before, *objective)
+        gain = np.empty((len(selected), len(candidates)))
+        for i, row in enumerate(delta):
+            gain[i] = np.bincount(nz_rows, weights=row, minlength=len(candidates))
+        gain += (_objective(removed, *objective) - base)[:, None]
+        evaluated += gain.size
+        score = gain + same_role_bonus * same_role
+        # only swaps that improve the terms themselves, using each bullet at most once
+        score[gain <= 0] = -np.inf
+        score[used_from, :] = -np.inf
+        score[:, used_to] = -np.inf
+        i, j = divmod(int(np.argmax(score)), len(candidates))
+        if not score[i, j] > 0:
+            break
+        gain = float(gain[i, j])
+
+        new_d = d - S[i] + C[j]
+        promotions.append({
+            "from_bullet": selected[i],
+            "to_bullet": candidates[j],
+            "role_tuple": candidate_roles[cand_ids[j]] if candidate_roles is not None else None,
+            "same_role": bool(same_role[i, j]),
+            "gain": gain,
+            "new_terms": [terms[t] for t in np.flatnonzero((d == 0) & (new_d > 0))],
+        })
+        d = new_d
+        used_from[i] = True
+        used_to[j] = True
+
+    inc("swaps_evaluated", evaluated)
+    return {
+        "promotions": promotions,
+        "stats": {
+            "selected": len(selected),
+            "candidates": len(candidates),
+            "swaps_evaluated": evaluated,
+            "seconds": time.perf_counter() - started,
+        },
+    }
+
+def evaluate_bank_swaps(
+    selected_bullets: Sequence[str],
+    must_terms: List[str],
+    synonyms: Dict[str, List[str]],
+    bank_path: str,
+    density_target: int = 2,
+    max_promotions: int = 3,
+    current_density: Optional[Sequence[int]] = None,
+    **kwargs,
+) -> Dict:
+    """
+    `evaluate_swaps` against an experience bank.
+
+    Candidates are the bank bullets that hit at least one JD term (a posting-list merge on
+    the cached term index), and their term counts come straight from the index's memoized
+    per-term postings, so only the selected bullets are scanned. Roles come from the cached
+    role index, so swaps within the role of the bullet being replaced get the same-role
+    bonus.
+    """
+    profile = get_jd_profile(must_terms, synonyms)
+    index = load_term_index(bank_path)
+    roles = load_role_index(bank_path)
+    postings = [index.term_postings([term] + list(vlist)) for term, vlist in profile.terms]
+    cand = sorted({j for p in postings for j in p})
+    row = {j: k for k, j in enumerate(cand)}
+    counts = np.zeros((len(cand), len(postings)), dtype=np.int32)
+    for t, p in enumerate(postings):
+        if p:
+            counts[[row[j] for j in p], t] = list(p.values())
+    return evaluate_swaps(
+        selected_bullets,
+        [index.bullets[j] for j in cand],
+        must_terms,
+        synonyms,
+        density_target=density_target,
+        max_promotions=max_promotions,
+        current_density=current_density,
+        selected_roles=[roles.role_for(b) for b in selected_bullets],
+        candidate_roles=[roles.roles[j] for j in cand],
+        candidate_counts=counts,
+        candidate_norms=[index._norm[j] for j in cand],
+        **kwargs,
+    )
@@ -0,0 +1,204 @@
+import os
+import re
+import threading
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+from src.tools.bank import _signature, load_bank
+from src.tools.scoring import _tokenize
+
+# Bank columns indexed for relevance, with the weight of their tokens
+FIELD_WEIGHTS = {
+    "bullet_text": 1.0,
+    "skills": 0.5,
+    "tools": 0.5,
+    "methods": 0.5,
+    "keywords_explicit": 0.75,
+}
+
+# Compiled index written next to the CSV: experience_bank.csv -> experience_bank.csv.tfidf.npz
+TFIDF_SUFFIX = ".tfidf.npz"
+
+_WORD_RE = re.compile(r"[a-z0-9+#]+")
+
+def _stem(word: str) -> str:
+    """Fold plurals so "dashboards" and "dashboard" share a feature."""
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+def features(text: str) -> List[str]:
+    """Unigrams and bigrams of stemmed words; "Power-BI" and "power bi" give the same ones."""
+    words = [_stem(w) for w in _WORD_RE.findall(_tokenize(text))]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+class RelevanceIndex:
+    """
+    Sparse TF-IDF matrix over experience bank bullets, for ranking a whole bank by a JD.
+
+    Each bullet is a document made of its FIELD_WEIGHTS columns (field-weighted term
+    frequencies, sublinear tf, smoothed idf, L2-normalized rows). The matrix is stored
+    column-major (feature -> bullet ids, weights), so a JD query, which only touches a few
+    features, is ranked with one sparse mat-vec over those columns. No models or network:
+    everything is derived from the bank itself.
+    """
+
+    def __init__(self, vocabulary: Sequence[str], idf: np.ndarray, col_ptr: np.ndarray,
+                 rows: np.ndarray, data: np.ndarray, n_bullets: int):
+        self.vocabulary = {f: j for j, f in enumerate(vocabulary)}
+        self.idf = idf
+        self.col_ptr = col_ptr
+        self.rows = rows
+        self.data = data
+        self.n_bullets = n_bullets
+
+    @classmethod
+    def from_frame(cls, df: "pd.DataFrame",
+                   field_weights: Optional[Dict[str, float]] = None) -> "RelevanceIndex":
+        weights = FIELD_WEIGHTS if field_weights is None else field_weights
+        n = len(df)
+        columns = [(df[c].astype(str).tolist(), w) for c, w in weights.items() if c in df.columns]
+
+        vocab: Dict[str, int] = {}
+        parsed: Dict[str, List[int]] = {}       # field value -> feature ids (values repeat a lot)
+        doc_rows: List[int] = []
+        doc_cols: List[int] = []
+        doc_tf: List[float] = []
+        for i in range(n):
+            tf: Dict[int, float] = {}
+            for values, w in columns:
+                ids = parsed.get(values[i])
+                if ids is None:
+                    ids = parsed[values[i]] = [vocab.setdefault(f, len(vocab)) for f in features(values[i])]
+                for j in ids:
+                    tf[j] = tf.get(j, 0.0) + w
+            doc_rows.extend([i] * len(tf))
+            doc_cols.extend(tf)
+            doc_tf.extend(tf.values())
+
+        rows = np.asarray(doc_rows, dtype=np.int32)
+        cols = np.asarray(doc_cols, dtype=np.int32)
+        tf = np.asarray(doc_tf, dtype=np.float64)
+        df_count = np.bincount(cols, minlength=len(vocab))
+        idf = np.log((1.0 + n) / (1.0 + df_count)) + 1.0
+        # sublinear tf (1 + log tf) for tf >= 1; field weights can make tf fractional
+        data = np.where(tf >= 1.0, 1.0 + np.log(np.maximum(tf, 1.0)), tf) * idf[cols]
+        norms = np.sqrt(np.bincount(rows, weights=data * data, minlength=n))
+        data = data / np.where(norms > 0, norms, 1.0)[rows]
+
+        # column-major: sort entries by feature, then bullet
+        order = np.lexsort((rows, cols))
+        col_ptr = np.zeros(len(vocab) + 1, dtype=np.int64)
+        np.cumsum(df_count, out=col_ptr[1:])
+        vocabulary = [None] * len(vocab)
+        for f, j in vocab.items():
+            vocabulary[j] = f
+        return cls(vocabulary, idf.astype(np.float32), col_ptr, rows[order],
+                   data[order].astype(np.float32), n)
+
+    def query_vector(self, texts: Iterable[str]) -> Dict[int, float]:
+        """Normalized TF-IDF weights (feature id -> weight) of a query; unknown features dropped."""
+        tf: Dict[int, float] = {}
+        for text in texts:
+            for f in features(text):
+                j = self.vocabulary.get(f)
+                if j is not None:
+                    tf[j] = tf.get(j, 0.0) + 1.0
+        q = {j: (1.0 + np.log(c)) * float(self.idf[j]) for j, c in tf.items()}
+        norm = float(np.sqrt(sum(w * w for w in q.values())))
+        return {j: w / norm for j, w in q.items()} if norm else {}
+
+    def scores(self, texts: Iterable[str]) -> np.ndarray:
+        """Cosine similarity of every bullet to the query `texts` (dense, one per bullet)."""
+        out = np.zeros(self.n_bullets, dtype=np.float32)
+        for j, w in self.query_vector(texts).items():
+            lo, hi = self.col_ptr[j], self.col_ptr[j + 1]
+            # a bullet appears at most once per column, so plain fancy-index add is exact
+            out[self.rows[lo:hi]] += w * self.data[lo:hi]
+        return out
+
+    def jd_scores(self, must_terms: List[str],
+                  synonyms: Optional[Dict[str, List[str]]] = None) -> np.ndarray:
+        """`scores` for a JD: its must-have terms plus every variant in `synonyms`."""
+        texts = list(must_terms)
+        for variants in (synonyms or {}).values():
+            texts.extend(variants or ())
+        return self.scores(texts)
+
+    def top_k(self, scores: np.ndarray, k: int, min_score: float = 0.0) -> List[Tuple[int, float]]:
+        """Best `k` (bullet id, score) with score > `min_score`, best first (ties: bank order)."""
+        ids = np.flatnonzero(scores > min_score)
+        if len(ids) > k:
+            ids = ids[np.argpartition(-scores[ids], k - 1)[:k]]
+        ids = ids[np.lexsort((ids, -scores[ids]))]
+        return [(int(i), float(scores[i])) for i in ids]
+
+    def rank(self, must_terms: List[str], synonyms: Optional[Dict[str, List[str]]] = None,
+             k: int = 50, min_score: float = 0.0) -> List[Tuple[int, float]]:
+        """Top-`k` bullets for a JD, including near misses without a literal variant."""
+        return self.top_k(self.jd_scores(must_terms, synonyms), k, min_score)
+
+    def save(self, path: str, signature: Tuple[int, int] = (0, 0)) -> None:
+        vocabulary = [None] * len(self.vocabulary)
+        for f, j in self.vocabulary.items():
+            vocabulary[j] = f
+        tmp = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(
+            tmp, vocabulary=np.asarray(vocabulary, dtype=str), idf=self.idf,
+            col_ptr=self.col_ptr, rows=self.rows, data=self.data,
+            n_bullets=np.int64(self.n_bullets), signature=np.asarray(signature, dtype=np.int64),
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> Tuple["RelevanceIndex", Tuple[int, int]]:
+        with np.load(path, allow_pickle=False) as z:
+            index = cls(z["vocabulary"].tolist(), z["idf"], z["col_ptr"], z["rows"], z["data"],
+                        int(z["n_bullets"]))
+            return index, tuple(int(x) for x in z["signature"])
+
+def tfidf_path(bank_path: str) -> str:
+    return bank_path + TFIDF_SUFFIX
+
+def compile_relevance_index(bank_path: str) -> str:
+    """Build the index for `bank_path` offline and write it next to the CSV; returns its path."""
+    key = os.path.abspath(bank_path)
+    sig = _signature(key)
+    out = tfidf_path(key)
+    RelevanceIndex.from_frame(load_bank(key)).save(out, sig)
+    return out
+
+_relevance_cache: Dict[str, Tuple[object, RelevanceIndex]] = {}
+_relevance_lock = threading.Lock()
+
+def load_relevance_index(bank_path: str) -> RelevanceIndex:
+    """
+    The `RelevanceIndex` of the bank at `bank_path`, one per loaded bank version.
+
+    A compiled `.tfidf.npz` next to the CSV is used while its signature matches the CSV;
+    otherwise the index is built from the cached bank frame.
+    """
+    key = os.path.abspath(bank_path)
+    df = load_bank(key)
+    with _relevance_lock:
+        hit = _relevance_cache.get(key)
+    if hit is not None and hit[0] is df:
+        return hit[1]
+    index = None
+    try:
+        loaded, sig = RelevanceIndex.load(tfidf_path(key))
+        if sig == _signature(key) and loaded.n_bullets == len(df):
+            index = loaded
+    except Exception:                   # missing, truncated or foreign file: rebuild
+        pass
+    if index is None:
+        index = RelevanceIndex.from_frame(df)
+    with _relevance_lock:
+        _relevance_cache[key] = (df, index)
+    return index
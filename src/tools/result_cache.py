@@ -0,0 +1,172 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.common.llm_cache import LLMCache
+from src.common.metrics import inc
+from src.tools.scoring import compute_metrics, jd_profile_key
+
+# Cache of finished scoring reports; RESULT_CACHE=off bypasses it entirely
+RESULT_CACHE_ENABLED = os.getenv("RESULT_CACHE", "on").lower() not in ("0", "off", "false", "no")
+RESULT_CACHE_BACKEND = os.getenv("RESULT_CACHE_BACKEND", "memory")       # memory | sqlite
+RESULT_CACHE_PATH = os.getenv("RESULT_CACHE_PATH", os.path.join(".cache", "result_cache.sqlite3"))
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "2048"))
+RESULT_CACHE_TTL_S = float(os.getenv("RESULT_CACHE_TTL_S", "0"))           # 0 = no expiry
+
+def normalize_resume(resume_text: str) -> str:
+    """
+    Resume text with cosmetic differences removed: blank lines dropped, runs of spaces and
+    tabs collapsed, lines stripped. Line breaks and case are kept, since section headers
+    depend on them.
+    """
+    lines = (re.sub(r"[ \t]+", " ", line).strip() for line in (resume_text or "").splitlines())
+    return "\n".join(line for line in lines if line)
+
+def result_key(
+    resume_text: str,
+    must_terms: List[str],
+    synonyms: Optional[Dict[str, List[str]]],
+    **thresholds: Any,
+) -> str:
+    """
+    Fingerprint of one scoring request: hashes of the normalized resume, the compiled JD
+    profile (`jd_profile_key`) and the thresholds (density_target, coverage/placement
+    targets, ...); None thresholds are ignored.
+    """
+    resume = hashlib.sha1(normalize_resume(resume_text).encode("utf-8")).hexdigest()
+    payload = json.dumps(
+        {
+            "resume": resume,
+            "jd": jd_profile_key(must_terms, synonyms),
+            "thresholds": {k: v for k, v in thresholds.items() if v is not None},
+        },
+        sort_keys=True, default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class _MemoryStore:
+    """In-process LRU of key -> (created, JSON text)."""
+
+    def __init__(self, max_entries: int, max_age_s: float):
+        self.max_entries = max_entries
+        self.max_age_s = max_age_s
+        self._data: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            hit = self._data.get(key)
+            if hit is None:
+                return None
+            if time.time() - hit[0] > self.max_age_s:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return hit[1]
+
+    def put(self, key: str, value: str) -> None:
+        with self._lock:
+            self._data[key] = (time.time(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+class ResultCache:
+    """
+    Bounded LRU of scoring reports keyed by `result_key`, with optional TTL.
+
+    Reports are stored as JSON, so every hit is a fresh copy the caller may mutate. The
+    backend is an in-process LRU ("memory") or the SQLite store also used for LLM
+    responses ("sqlite", shared across workers and restarts).
+    """
+
+    def __init__(
+        self,
+        backend: str = RESULT_CACHE_BACKEND,
+        path: str = RESULT_CACHE_PATH,
+        max_entries: int = RESULT_CACHE_MAX_ENTRIES,
+        ttl_s: float = RESULT_CACHE_TTL_S,
+    ):
+        max_age_s = ttl_s if ttl_s and ttl_s > 0 else float("inf")
+        if backend == "sqlite":
+            self._store = LLMCache(path, max_entries, max_age_s, table="result_cache")
+        elif backend == "memory":
+            self._store = _MemoryStore(max_entries, max_age_s)
+        else:
+            raise ValueError(f"unknown result cache backend: {backend!r}")
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Dict]:
+        value = self._store.get(key)
+        if value is None:
+            self.misses += 1
+            inc("result_cache_misses")
+            return None
+        self.hits += 1
+        inc("result_cache_hits")
+        return json.loads(value)
+
+    def put(self, key: str, report: Dict) -> None:
+        self._store.put(key, json.dumps(report, ensure_ascii=False))
+
+    def get_or_compute(self, key: str, compute: Callable[[], Dict]) -> Dict:
+        """
+        The cached report for `key`, or `compute()` stored under it. The returned report
+        carries `"cached": True/False` so responses can say where they came from.
+        """
+        report = self.get(key)
+        if report is not None:
+            report["cached"] = True
+            return report
+        report = dict(compute())
+        report.pop("cached", None)
+        self.put(key, report)
+        report["cached"] = False
+        return report
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.backend, "hits": self.hits, "misses": self.misses}
+
+_cache: Optional[ResultCache] = None
+_cache_lock = threading.Lock()
+
+def get_result_cache() -> Optional[ResultCache]:
+    """The process-wide result cache, or None when RESULT_CACHE=off."""
+    global _cache
+    if not RESULT_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResultCache()
+        return _cache
+
+def cached_metrics(
+    resume_text: str,
+    must_terms: List[str],
+    synonyms: Dict[str, List[str]],
+    density_target: int = 2,
+    use_cache: bool = True,
+) -> Dict:
+    """`compute_metrics` through the result cache; the report gains a "cached" flag."""
+    cache = get_result_cache() if use_cache else None
+    if cache is None:
+        report = compute_metrics(resume_text, must_terms, synonyms, density_target=density_target)
+        return dict(report, cached=False)
+    key = result_key(resume_text, must_terms, synonyms, density_target=density_target)
+    return cache.get_or_compute(
+        key, lambda: compute_metrics(resume_text, must_terms, synonyms, density_target=density_target)
+    )
@@ -0,0 +1,111 @@
+import heapq
+import os
+import threading
+from typing import TYPE_CHECKING, Callable, List, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+from src.tools.bank import ROLE_COLUMNS, load_bank
+from src.tools.scoring import _tokenize
+
+# Composite ranking score = sum(weight * column); override per index
+DEFAULT_SCORE_WEIGHTS = {"recency_score": 1.0, "impact_score": 1.0, "leadership_score": 1.0}
+
+RoleTuple = Tuple[str, ...]
+
+class RoleIndex:
+    """
+    Precomputed role view of an experience bank:
+
+    - role tuple (role_title, company, location, start_yyyy_mm, end_yyyy_mm) -> bullet ids,
+      pre-sorted by a composite of the score columns (best first)
+    - normalized bullet text -> role tuple, to find which roles a selection belongs to
+
+    Ranking is done once per bank, so per-request backfill only needs `top_k` (a walk of the
+    pre-sorted list, or a heap over it when a request-specific key is given).
+    """
+
+    def __init__(self, df: "pd.DataFrame", weights: Optional[Dict[str, float]] = None):
+        import pandas as pd
+
+        self.weights = dict(DEFAULT_SCORE_WEIGHTS if weights is None else weights)
+        self.bullets: List[str] = df["bullet_text"].astype(str).tolist()
+        self.roles: List[RoleTuple] = list(zip(*(df[c].astype(str).tolist() for c in ROLE_COLUMNS)))
+
+        score = np.zeros(len(df))
+        for col, w in self.weights.items():
+            if col in df.columns:
+                score += w * pd.to_numeric(df[col], errors="coerce").fillna(0.0).to_numpy(dtype=float)
+        self.scores = score
+
+        # stable sort: ties keep bank order
+        order = np.argsort(-score, kind="stable")
+        self._by_role: Dict[RoleTuple, List[int]] = {}
+        for i in order.tolist():
+            self._by_role.setdefault(self.roles[i], []).append(i)
+
+        self._role_by_text: Dict[str, RoleTuple] = {}
+        for i, text in enumerate(self.bullets):
+            self._role_by_text.setdefault(_tokenize(text), self.roles[i])
+
+    def role_for(self, bullet_text: str) -> Optional[RoleTuple]:
+        """The role a bullet belongs to (matched on normalized text), if it is in the bank."""
+        return self._role_by_text.get(_tokenize(bullet_text))
+
+    def group_by_role(self, bullets: Iterable[str]) -> Dict[RoleTuple, List[str]]:
+        """Group a selection by role, roles in order of first appearance; unknown bullets dropped."""
+        out: Dict[RoleTuple, List[str]] = {}
+        for b in bullets:
+            role = self.role_for(b)
+            if role is not None:
+                out.setdefault(role, []).append(b)
+        return out
+
+    def ranked(self, role: RoleTuple) -> List[int]:
+        """All bullet ids of `role`, best composite score first."""
+        return self._by_role.get(tuple(role), [])
+
+    def top_k(
+        self,
+        role: RoleTuple,
+        k: int,
+        exclude: Iterable[str] = (),
+        key: Optional[Callable[[int], float]] = None,
+    ) -> List[int]:
+        """
+        Best `k` bullet ids of `role`, skipping bullets whose text is in `exclude`.
+
+        Without `key` this walks the pre-sorted list and stops after `k` hits. With `key`
+        (e.g. JD hits of a bullet) candidates are ranked by `(key(id), composite score)`
+        using a heap, without re-sorting the whole role.
+        """
+        skip = {_tokenize(b) for b in exclude}
+        ids = (i for i in self.ranked(role) if _tokenize(self.bullets[i]) not in skip)
+        if key is None:
+            out = []
+            for i in ids:
+                if len(out) >= k:
+                    break
+                out.append(i)
+            return out
+        return heapq.nlargest(k, ids, key=lambda i: (key(i), self.scores[i]))
+
+_role_cache: Dict[Tuple[str, tuple], Tuple[object, RoleIndex]] = {}
+_role_lock = threading.Lock()
+
+def load_role_index(bank_path: str, weights: Optional[Dict[str, float]] = None) -> RoleIndex:
+    """The `RoleIndex` for the bank at `bank_path`, rebuilt only when the bank changes."""
+    path = os.path.abspath(bank_path)
+    key = (path, tuple(sorted((DEFAULT_SCORE_WEIGHTS if weights is None else weights).items())))
+    df = load_bank(path)
+    with _role_lock:
+        hit = _role_cache.get(key)
+    if hit is not None and hit[0] is df:
+        return hit[1]
+    index = RoleIndex(df, weights)
+    with _role_lock:
+        _role_cache[key] = (df, index)
+    return index
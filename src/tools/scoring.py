@@ -1,15 +1,535 @@
+import hashlib
+import json
 import re
-from typing import List, Dict
+import threading
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict, deque
+from itertools import islice
+from typing import List, Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+from src.common.metrics import inc, stage
+
+# How many compiled JD profiles to keep around (the /realign loop re-scores the same JD)
+JD_PROFILE_CACHE_SIZE = 64
+
+# Header lines we recognize in any case (alone on a line, optionally followed by ':'),
+# mapped to the section name used in the span table
+SECTION_ALIASES = {
+    "headline": "HEADLINE",
+    "summary": "SUMMARY",
+    "professional summary": "SUMMARY",
+    "profile": "SUMMARY",
+    "objective": "SUMMARY",
+    "experience": "EXPERIENCE",
+    "work experience": "EXPERIENCE",
+    "professional experience": "EXPERIENCE",
+    "employment history": "EXPERIENCE",
+    "skills": "SKILLS",
+    "core skills": "SKILLS",
+    "technical skills": "SKILLS",
+    "certifications": "CERTIFICATIONS",
+    "certificates": "CERTIFICATIONS",
+    "education": "EDUCATION",
+    "projects": "PROJECTS",
+    "leadership": "LEADERSHIP",
+    "awards": "AWARDS",
+    "publications": "PUBLICATIONS",
+    "languages": "LANGUAGES",
+    "volunteering": "VOLUNTEERING",
+    "interests": "INTERESTS",
+}
+
+# Any other ALL-CAPS line ending in ':' (e.g. "KEY ACHIEVEMENTS:") also opens a section
+_CAPS_HEADER_RE = re.compile(r"[A-Z][A-Z &/]{2,}:")
+
+# Markdown heading/emphasis around a header ("## Experience", "**EXPERIENCE**")
+_HEADER_DECOR_RE = re.compile(r"^#{1,6}\s+|[*_]{2,}")
+# Qualifier after a header name: "Experience (2019-2024)", "Experience - 2019 to present"
+_HEADER_TAIL_RE = re.compile(r"\s*(?:\([^)]*\)|[-\u2013\u2014|,]?\s*\d{4}\b.*)$")
+# Words that may stay lowercase in a Title Case header ("Skills and Tools")
+_HEADER_SMALL_WORDS = {"and", "of", "the", "for", "to", "in", "&"}
+# Words that may qualify a section alias in a header ("Relevant Experience", "Key Skills");
+# anything else ("Head of Projects", "Customer Experience") is content unless it ends in ':'
+_HEADER_QUALIFIERS = {
+    "relevant", "professional", "work", "technical", "core", "key", "selected", "additional",
+    "recent", "related", "industry", "career", "academic", "other", "tools", "technologies",
+    "highlights", "history", "and", "&",
+}
 
 def _tokenize(text: str) -> str:
     """Lowercase and collapse whitespace so matching is simpler."""
     return re.sub(r"\s+", " ", text.lower()).strip()
 
+def _is_word(ch: str) -> bool:
+    """Same notion of a 'word' character as the `\\b` anchor in `re`."""
+    return ch.isalnum() or ch == "_"
+
+def _at_boundary(text: str, i: int) -> bool:
+    """True when a `\\b` anchor would match at offset `i` of `text`."""
+    left = i > 0 and _is_word(text[i - 1])
+    right = i < len(text) and _is_word(text[i])
+    return left != right
+
+def _trie_pattern(node: Dict) -> str:
+    """Render a character trie as a regex; deeper branches are tried first (longest match)."""
+    alts = [re.escape(ch) + _trie_pattern(child) for ch, child in sorted(node.items()) if ch]
+    if not alts:
+        return ""
+    body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+    if "" in node:
+        # a variant ends here: make the longer continuations optional (greedy)
+        return "(?:" + body + ")?"
+    return body
+
+class _VariantMatcher:
+    """
+    One compiled pattern for a whole set of (lowercase) variants.
+
+    The variants are folded into a character trie and rendered as a single regex wrapped in
+    a lookahead, so one `finditer` pass visits every start offset of the text and reports the
+    longest word-bounded variant found there. Shorter variants that match at the same offset
+    are necessarily prefixes of that longest hit, so they are recovered from a precomputed
+    prefix table plus a boundary check instead of another scan.
+    """
+
+    def __init__(self, variants: List[str]):
+        self.variants = list(dict.fromkeys(v for v in variants if v))
+        trie: Dict = {}
+        for v in self.variants:
+            node = trie
+            for ch in v:
+                node = node.setdefault(ch, {})
+            node[""] = {}
+        # Walk each variant down the trie; every terminal passed on the way is a shorter prefix
+        self._prefixes: Dict[str, List[str]] = {}
+        for v in self.variants:
+            node, found = trie, []
+            for i, ch in enumerate(v[:-1], 1):
+                node = node[ch]
+                if "" in node:
+                    found.append(v[:i])
+            if found:
+                self._prefixes[v] = found
+        self._regex = (
+            re.compile(rf"(?=\b({_trie_pattern(trie)})\b)") if self.variants else None
+        )
+
+    def scan(self, text: str) -> Iterator[Tuple[int, str]]:
+        """Yield `(start, variant)` for every word-bounded occurrence, overlaps included."""
+        if self._regex is None:
+            return
+        for m in self._regex.finditer(text):
+            start, hit = m.start(), m.group(1)
+            for u in self._prefixes.get(hit, ()):
+                if _at_boundary(text, start + len(u)):
+                    yield start, u
+            yield start, hit
+
+def _alias_in_header(head: str, colon: bool = False) -> Optional[str]:
+    """
+    Section of a header-looking `head` that starts or ends with a known alias
+    ("Relevant Experience", "Skills and Tools"). Only short, Title Case or ALL-CAPS heads
+    qualify, and the words besides the alias must be `_HEADER_QUALIFIERS` unless the line
+    ends in ':', so job titles ("Director of Education") and skills ("Customer
+    Experience") stay content.
+    """
+    words = head.split()
+    if not 1 < len(words) <= 3 or any(not w[0].isupper() for w in words
+                                      if w.lower() not in _HEADER_SMALL_WORDS):
+        return None
+    low = " ".join(words).lower()
+    for alias, name in SECTION_ALIASES.items():
+        if low.startswith(alias + " "):
+            extra = low[len(alias) + 1:]
+        elif low.endswith(" " + alias):
+            extra = low[:-len(alias) - 1]
+        else:
+            continue
+        if colon or all(w in _HEADER_QUALIFIERS for w in extra.split()):
+            return name
+    return None
+
+def _section_header(line: str) -> Optional[Tuple[str, str]]:
+    """
+    `(section_name, inline_content)` if `line` opens a section, else None.
+
+    Markdown decoration is ignored, and a trailing date range or parenthetical is dropped
+    before the alias lookup; short Title Case / ALL-CAPS heads made of an alias plus
+    qualifiers ("RELEVANT EXPERIENCE"), or ending in ':', also count.
+    """
+    stripped = line.strip()
+    head, colon, rest = stripped.partition(":")
+    head = re.sub(r"\s+", " ", _HEADER_DECOR_RE.sub("", head)).strip()
+    if colon:
+        rest = rest.lstrip("*_ ")
+    elif not head or head[0] in "-\u2022":
+        return None                                     # list item, not a header
+    name = SECTION_ALIASES.get(head.lower())
+    if name is None:
+        head = _HEADER_TAIL_RE.sub("", head)
+        name = SECTION_ALIASES.get(head.lower()) or _alias_in_header(head, bool(colon) and not rest.strip())
+    if name:
+        return name, rest
+    if _CAPS_HEADER_RE.fullmatch(stripped):
+        return re.sub(r"\s+", " ", stripped[:-1].strip()), ""
+    return None
+
+def parse_sections(resume_text: str) -> Tuple[str, List[Tuple[str, int, int]]]:
+    """
+    Normalize the resume and segment it in one pass over its lines.
+
+    Returns `(text_full, sections)` where `text_full == _tokenize(resume_text)` and
+    `sections` is an ordered span table of `(name, start, end)` character offsets into
+    `text_full`. A section runs from the content after its header line (or after
+    "Header:" when content follows on the same line) to the end of the last content line
+    before the next header. Text before the first header is not part of any section.
+    """
+    parts: List[str] = []
+    pos = 0              # length of the normalized text built so far
+    sections: List[Tuple[str, int, int]] = []
+    current: Optional[Tuple[str, int]] = None
+    content_end = 0
+
+    for line in resume_text.splitlines():
+        norm = _tokenize(line)
+        if not norm:
+            continue
+        line_start = pos + 1 if parts else 0
+        header = _section_header(line)
+        if header is not None:
+            if current is not None and content_end > current[1]:
+                sections.append((current[0], current[1], content_end))
+            name, inline = header
+            inline_norm = _tokenize(inline)
+            if inline_norm:
+                # "Experience: built X" -> the section starts at "built x"
+                current = (name, line_start + len(norm) - len(inline_norm))
+            else:
+                current = (name, line_start + len(norm) + 1)
+            content_end = current[1] if not inline_norm else line_start + len(norm)
+        else:
+            content_end = line_start + len(norm)
+        parts.append(norm)
+        pos = line_start + len(norm)
+
+    if current is not None and content_end > current[1]:
+        sections.append((current[0], current[1], content_end))
+    return " ".join(parts), sections
+
+def _tally(
+    hits: Iterator[Tuple[int, str]],
+    sections: Optional[List[Tuple[str, int, int]]] = None,
+) -> Tuple[Dict[str, int], Dict[str, set]]:
+    """
+    Fold matcher hits into per-variant counts and the set of sections each variant hit in.
+
+    Counts follow `re.findall` semantics for each variant on its own: occurrences of the same
+    variant never overlap, while different variants are counted independently. Placement is
+    a bisect of the hit offset into the (sorted, non-overlapping) section span table.
+    """
+    sections = sections or []
+    starts = [s for _, s, _ in sections]
+    counts: Dict[str, int] = {}
+    last_end: Dict[str, int] = {}
+    placed: Dict[str, set] = {}
+    for start, v in hits:
+        end = start + len(v)
+        if start >= last_end.get(v, 0):
+            counts[v] = counts.get(v, 0) + 1
+            last_end[v] = end
+        i = bisect_right(starts, start) - 1
+        if i >= 0 and end <= sections[i][2]:
+            placed.setdefault(v, set()).add(sections[i][0])
+    return counts, placed
+
+def _synonym_index(synonyms: Optional[Dict[str, List[str]]]) -> Dict[str, List[str]]:
+    """Lowercase canonical term -> lowercase variants, merging keys that differ only by case."""
+    index: Dict[str, List[str]] = {}
+    for canon, vs in (synonyms or {}).items():
+        index.setdefault(str(canon).lower(), []).extend(str(v).lower() for v in (vs or []))
+    return index
+
+def jd_profile_key(must_terms: List[str], synonyms: Optional[Dict[str, List[str]]]) -> str:
+    """Content hash of a JD's scoring inputs (term order and synonym order both matter)."""
+    payload = json.dumps(
+        [list(must_terms or []), list((synonyms or {}).items())],
+        ensure_ascii=False, default=str,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+class JDProfile:
+    """
+    Everything about a JD that does not depend on the resume, computed once:
+
+    - terms: (term, variants) pairs after stripping blanks and expanding synonyms
+    - matcher: the compiled single-pass matcher over all variants of all terms
+    - key: content hash of (must_terms, synonyms), used by the profile cache
+
+    `synonyms` is the canonical term -> variants map, i.e. the output of
+    `build_canonical_variants` / `_augment_synonyms`.
+    """
+
+    def __init__(self, must_terms: List[str], synonyms: Optional[Dict[str, List[str]]]):
+        self.key = jd_profile_key(must_terms, synonyms)
+        # Blank terms are skipped but still count in the coverage/placement denominators
+        self.n_terms = len(must_terms or [])
+
+        index = _synonym_index(synonyms)
+        self.terms: List[Tuple[str, List[str]]] = []
+        for term in must_terms or []:
+            term = (term or "").strip()
+            if not term:
+                continue
+            variants = [term.lower()] + index.get(term.lower(), [])
+            # Deduplicate variants while preserving order
+            self.terms.append((term, list(dict.fromkeys(variants))))
+
+        self.matcher = _VariantMatcher([v for _, vlist in self.terms for v in vlist])
+
+    def score(self, resume_text: str, density_target: int = 2, compact: bool = False):
+        """
+        Score one resume against this JD; same output as `compute_metrics`, or a
+        `CompactMetrics` with `compact=True`.
+        """
+        with stage("section_parse"):
+            text_full, sections = parse_sections(resume_text)
+        # One pass over the resume for every variant of every term
+        with stage("term_match"):
+            counts, placed = _tally(self.matcher.scan(text_full), sections)
+        inc("terms_scored", len(self.terms))
+        inc("variants_matched", sum(counts.values()))
+
+        if compact:
+            return CompactMetrics.from_tally(self, counts, placed, density_target)
+
+        results = []
+        covered_count = 0
+        in_experience_count = 0
+
+        for term, vlist in self.terms:
+            density = sum(counts.get(v, 0) for v in vlist)
+            term_sections = set().union(*(placed.get(v, ()) for v in vlist))
+            in_experience = "EXPERIENCE" in term_sections
+
+            if density > 0:
+                covered_count += 1
+            if in_experience:
+                in_experience_count += 1
+
+            results.append({
+                "term": term,
+                "variants": list(vlist),
+                "density": density,
+                "in_experience": in_experience,
+                "sections": sorted(term_sections),
+            })
+
+        coverage = (covered_count / self.n_terms) if self.n_terms else 0.0
+        placement_ratio = (in_experience_count / self.n_terms) if self.n_terms else 0.0
+
+        low_density_terms = [
+            {"term": r["term"], "density": r["density"]}
+            for r in results
+            if 0 < r["density"] < density_target
+        ]
+        missing_terms = [r["term"] for r in results if r["density"] == 0]
+
+        return {
+            "coverage": coverage,
+            "missing_terms": missing_terms,
+            "low_density_terms": low_density_terms,
+            "placement_ratio": placement_ratio,
+            "term_results": results
+        }
+
+class CompactMetrics:
+    """
+    `compute_metrics` result stored as parallel arrays over the terms of a `JDProfile`.
+
+    Per term only the density and a bitmask of the sections it appears in are kept (bit k
+    = `section_names[k]`); terms and variants are read from the shared profile. The report
+    keys (coverage, missing_terms, low_density_terms, placement_ratio, term_results) work
+    with `report[key]` like the dict form, but the lists and per-term dicts are only built
+    when asked for. `to_json` / `from_json` give a compact wire form that references the
+    JD by its profile key instead of repeating the terms.
+    """
+
+    __slots__ = (
+        "profile", "key", "density_target", "coverage", "placement_ratio",
+        "density", "section_names", "section_bits",
+    )
+
+    KEYS = ("coverage", "missing_terms", "low_density_terms", "placement_ratio", "term_results")
+
+    def __init__(self, profile: Optional["JDProfile"], key: str, density_target: int,
+                 coverage: float, placement_ratio: float, density: Sequence[int],
+                 section_names: Sequence[str], section_bits: Sequence[int]):
+        self.profile = profile
+        self.key = key
+        self.density_target = density_target
+        self.coverage = coverage
+        self.placement_ratio = placement_ratio
+        self.density = array("i", density)
+        self.section_names = tuple(section_names)
+        # up to 64 distinct sections fit an unsigned 64-bit mask
+        self.section_bits = array("Q", section_bits) if len(self.section_names) <= 64 else list(section_bits)
+
+    @classmethod
+    def from_tally(cls, profile: "JDProfile", counts: Dict[str, int],
+                   placed: Dict[str, set], density_target: int) -> "CompactMetrics":
+        names = sorted(set().union(*placed.values())) if placed else []
+        bit = {n: 1 << k for k, n in enumerate(names)}
+        exp_bit = bit.get("EXPERIENCE", 0)
+        vbits = {v: sum(bit[n] for n in secs) for v, secs in placed.items()}
+        density, bits = [], []
+        covered = in_experience = 0
+        for _, vlist in profile.terms:
+            d = 0
+            b = 0
+            for v in vlist:
+                d += counts.get(v, 0)
+                b |= vbits.get(v, 0)
+            density.append(d)
+            bits.append(b)
+            covered += d > 0
+            in_experience += bool(b & exp_bit)
+        n = profile.n_terms
+        return cls(
+            profile, profile.key, density_target,
+            (covered / n) if n else 0.0, (in_experience / n) if n else 0.0,
+            density, names, bits,
+        )
+
+    @property
+    def terms(self) -> List[str]:
+        return [t for t, _ in self.profile.terms]
+
+    def term_sections(self, i: int) -> List[str]:
+        b = self.section_bits[i]
+        return [n for k, n in enumerate(self.section_names) if b >> k & 1]
+
+    def in_experience(self, i: int) -> bool:
+        try:
+            k = self.section_names.index("EXPERIENCE")
+        except ValueError:
+            return False
+        return bool(self.section_bits[i] >> k & 1)
+
+    @property
+    def missing_terms(self) -> List[str]:
+        return [t for (t, _), d in zip(self.profile.terms, self.density) if d == 0]
+
+    @property
+    def low_density_terms(self) -> List[Dict]:
+        return [
+            {"term": t, "density": d}
+            for (t, _), d in zip(self.profile.terms, self.density)
+            if 0 < d < self.density_target
+        ]
+
+    @property
+    def placement_issues(self) -> List[str]:
+        return [t for i, (t, _) in enumerate(self.profile.terms) if not self.in_experience(i)]
+
+    def term_result(self, i: int) -> Dict:
+        term, vlist = self.profile.terms[i]
+        return {
+            "term": term,
+            "variants": list(vlist),
+            "density": self.density[i],
+            "in_experience": self.in_experience(i),
+            "sections": self.term_sections(i),
+        }
+
+    @property
+    def term_results(self) -> List[Dict]:
+        return [self.term_result(i) for i in range(len(self.density))]
+
+    def __getitem__(self, key: str):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.KEYS
+
+    def get(self, key: str, default=None):
+        return getattr(self, key) if key in self.KEYS else default
+
+    def keys(self):
+        return iter(self.KEYS)
+
+    def to_dict(self) -> Dict:
+        """The full `compute_metrics` dict."""
+        return {k: getattr(self, k) for k in self.KEYS}
+
+    def to_json(self) -> str:
+        """{"jd", "coverage", "placement_ratio", "density_target", "density", "sections", "bits"}."""
+        return json.dumps({
+            "jd": self.key,
+            "coverage": self.coverage,
+            "placement_ratio": self.placement_ratio,
+            "density_target": self.density_target,
+            "density": list(self.density),
+            "sections": list(self.section_names),
+            "bits": list(self.section_bits),
+        }, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, payload: str, profile: Optional["JDProfile"] = None) -> "CompactMetrics":
+        """Inverse of `to_json`; attach the JD's profile to read terms and variants."""
+        d = json.loads(payload)
+        return cls(profile, d["jd"], d["density_target"], d["coverage"], d["placement_ratio"],
+                   d["density"], d["sections"], d["bits"])
+
+    def __getstate__(self):
+        # the profile (and its compiled matcher) stays behind; reattach it after unpickling
+        return tuple(None if k == "profile" else getattr(self, k) for k in self.__slots__)
+
+    def __setstate__(self, state):
+        for k, v in zip(self.__slots__, state):
+            setattr(self, k, v)
+
+_profile_cache: "OrderedDict[str, JDProfile]" = OrderedDict()
+_profile_lock = threading.Lock()
+
+def get_jd_profile(must_terms: List[str], synonyms: Optional[Dict[str, List[str]]]) -> JDProfile:
+    """
+    Return the compiled `JDProfile` for this JD, building it only on a cache miss.
+
+    Profiles are keyed by content hash and kept in a process-wide LRU of
+    `JD_PROFILE_CACHE_SIZE` entries, so repeated scoring of the same JD (realign iterations,
+    phrase and atomic passes) skips variant expansion and matcher compilation.
+    """
+    key = jd_profile_key(must_terms, synonyms)
+    with _profile_lock:
+        profile = _profile_cache.get(key)
+        if profile is not None:
+            _profile_cache.move_to_end(key)
+            inc("jd_profile_cache_hits")
+            return profile
+    inc("jd_profile_cache_misses")
+    with stage("jd_profile_build"):
+        profile = JDProfile(must_terms, synonyms)
+    with _profile_lock:
+        _profile_cache[key] = profile
+        _profile_cache.move_to_end(key)
+        while len(_profile_cache) > JD_PROFILE_CACHE_SIZE:
+            _profile_cache.popitem(last=False)
+    return profile
+
+def clear_jd_profile_cache() -> None:
+    """Drop every cached JD profile."""
+    with _profile_lock:
+        _profile_cache.clear()
+
 def compute_metrics(
     resume_text: str,
     must_terms: List[str],
     synonyms: Dict[str, List[str]],
     density_target: int = 2,
+    compact: bool = False,
 ) -> Dict:
     """
     Compute simple ATS-style metrics:
@@ -17,89 +537,93 @@ def compute_metrics(
     - coverage: share of must-have terms found at least once (including synonyms)
     - low_density_terms: any must-have term that appears but fewer than `density_target` times
     - placement_ratio: share of must-have terms that appear inside the 'EXPERIENCE' section
-    - term_results: per-term details (variants used, counts, whether seen in experience)
+    - term_results: per-term details (variants used, counts, whether seen in experience,
+      which sections the term appears in)
 
     Notes:
-    - We look for an 'EXPERIENCE' section, then treat everything until the next ALL-CAPS header
-      (or end of text) as experience content.
+    - Sections come from `parse_sections`: a known header line (EXPERIENCE, SKILLS, ...) or an
+      ALL-CAPS "HEADER:" line opens a section that runs until the next header.
     - Matching is case-insensitive and uses word boundaries to avoid partial hits.
+    - All variants of all terms are matched in a single scan of the normalized resume; section
+      placement is an offset lookup on the matches rather than another search.
+    - The JD side (variant lists, compiled matcher) comes from the `get_jd_profile` cache.
+    - With `compact=True` a `CompactMetrics` is returned instead: same keys, but per-term
+      data stays in arrays that reference the JD profile until the dicts are asked for.
     """
-    text_full = _tokenize(resume_text)
-
-    # Try to isolate the EXPERIENCE block (so we can check placement there)
-    exp_block_norm = ""
-    # Find 'EXPERIENCE' until the next ALL-CAPS header (e.g., SKILLS, EDUCATION) or end of text
-    m = re.search(r"(?is)experience\s*(.+?)(?:\n[A-Z ]{3,}:|$)", resume_text)
-    if not m:
-        # fallback: everything after the first 'EXPERIENCE'
-        m = re.search(r"(?is)experience\s*(.+)$", resume_text)
-    if m:
-        exp_block_norm = _tokenize(m.group(1))
-
-    results = []
-    covered_count = 0
-    in_experience_count = 0
-
-    for term in must_terms:
-        term = (term or "").strip()
-        if not term:
-            continue
+    return get_jd_profile(must_terms, synonyms).score(resume_text, density_target, compact)
 
-        # Build variant list from synonyms map (canonical term -> variants[])
-        variants = [term.lower()]
-        for canon, vs in (synonyms or {}).items():
-            if str(canon).lower() == term.lower():
-                variants.extend([str(v).lower() for v in (vs or [])])
-
-        # Deduplicate variants while preserving order
-        seen = set()
-        vlist = []
-        for v in variants:
-            if v not in seen:
-                vlist.append(v); seen.add(v)
-
-        # Count appearances in the full resume (density)
-        density = 0
-        for v in vlist:
-            # word-boundary regex for safe matching
-            re_word = re.compile(rf"\b{re.escape(v)}\b", re.I)
-            density += len(re_word.findall(text_full))
-
-        # Check if any variant appears inside the EXPERIENCE block
-        in_experience = False
-        if exp_block_norm:
-            for v in vlist:
-                if re.search(rf"\b{re.escape(v)}\b", exp_block_norm, flags=re.I):
-                    in_experience = True
+# Worker-side JD profile for process-pool batch scoring (set once per worker process)
+_worker_profile: Optional[JDProfile] = None
+
+def _init_batch_worker(profile: JDProfile) -> None:
+    global _worker_profile
+    _worker_profile = profile
+
+def _score_chunk(texts: List[str], density_target: int, compact: bool = False) -> List[Dict]:
+    return [_worker_profile.score(t, density_target, compact) for t in texts]
+
+def iter_metrics_batch(
+    resumes: Iterable[str],
+    must_terms: List[str],
+    synonyms: Dict[str, List[str]],
+    density_target: int = 2,
+    processes: Optional[int] = None,
+    chunk_size: int = 64,
+    compact: bool = False,
+) -> Iterator[Dict]:
+    """
+    Stream `compute_metrics` results for many resumes against one JD, in input order.
+
+    The JD profile is built once. With `processes` > 1 the resumes are cut into chunks of
+    `chunk_size` and scored in a process pool; each worker receives the compiled profile
+    once at start-up, and only a bounded window of chunks is in flight so `resumes` can be
+    a lazy iterable of any length.
+
+    With `compact=True` results are `CompactMetrics`, which also keeps what workers send
+    back small (the profile is not pickled with each result; it is reattached here).
+    """
+    profile = get_jd_profile(must_terms, synonyms)
+    if not processes or processes <= 1:
+        for text in resumes:
+            yield profile.score(text, density_target, compact)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    it = iter(resumes)
+    with ProcessPoolExecutor(
+        max_workers=processes, initializer=_init_batch_worker, initargs=(profile,)
+    ) as pool:
+        pending = deque()
+        while True:
+            while len(pending) < processes * 2:
+                chunk = list(islice(it, chunk_size))
+                if not chunk:
                     break
+                pending.append(pool.submit(_score_chunk, chunk, density_target, compact))
+            if not pending:
+                break
+            for result in pending.popleft().result():
+                if compact:
+                    result.profile = profile
+                yield result
 
-        if density > 0:
-            covered_count += 1
-        if in_experience:
-            in_experience_count += 1
+def compute_metrics_batch(
+    resumes: Iterable[str],
+    must_terms: List[str],
+    synonyms: Dict[str, List[str]],
+    density_target: int = 2,
+    processes: Optional[int] = None,
+    chunk_size: int = 64,
+    compact: bool = False,
+) -> List[Dict]:
+    """
+    Score many resumes against one JD; returns one `compute_metrics`-shaped dict per resume.
 
-        results.append({
-            "term": term,
-            "variants": vlist,
-            "density": density,
-            "in_experience": in_experience
-        })
-
-    coverage = (covered_count / len(must_terms)) if must_terms else 0.0
-    placement_ratio = (in_experience_count / len(must_terms)) if must_terms else 0.0
-
-    low_density_terms = [
-        {"term": r["term"], "density": r["density"]}
-        for r in results
-        if 0 < r["density"] < density_target
-    ]
-    missing_terms = [r["term"] for r in results if r["density"] == 0]
-    placement_issues = [r["term"] for r in results if not r["in_experience"]]
-
-    return {
-        "coverage": coverage,
-        "missing_terms": missing_terms,
-        "low_density_terms": low_density_terms,
-        "placement_ratio": placement_ratio,
-        "term_results": results
-    }
\ No newline at end of file
+    See `iter_metrics_batch` for the process-pool and compact options.
+    """
+    return list(iter_metrics_batch(
+        resumes, must_terms, synonyms,
+        density_target=density_target, processes=processes, chunk_size=chunk_size,
+        compact=compact,
+    ))
@@ -0,0 +1,157 @@
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Iterable, Optional, Set, Tuple
+
+from src.common.metrics import inc
+from src.tools.bank import load_bank
+from src.tools.scoring import _VariantMatcher, _tally, _tokenize
+
+_WORD_RE = re.compile(r"\w+")
+
+# Verified variant postings kept per bank index beyond the build-time vocabulary (LRU)
+TERM_POSTINGS_CACHE_SIZE = int(os.getenv("TERM_POSTINGS_CACHE_SIZE", "4096"))
+
+class BankTermIndex:
+    """
+    Inverted index over experience bank bullets.
+
+    Bullets are normalized with `_tokenize` (the same lowercase / collapsed-whitespace form
+    `compute_metrics` matches against) and every word n-gram up to `max_ngram` words is
+    posted to the bullets containing it. A variant can only match (with word boundaries) a
+    bullet that contains its word tokens as a contiguous run, so its n-gram posting list is
+    an exact candidate set; candidates are then verified with the compiled matcher to get
+    per-bullet hit counts with `compute_metrics` semantics.
+
+    Verified postings (variant -> {bullet_id: hits}) are memoized on the index: the
+    `vocabulary` given at build time is kept for the index's lifetime, other variants in an
+    LRU of `max_postings` entries, so a long-running process serving many distinct JDs
+    does not grow without bound.
+    """
+
+    def __init__(self, bullets: Iterable[str], max_ngram: int = 3,
+                 vocabulary: Optional[Iterable[str]] = None,
+                 max_postings: int = TERM_POSTINGS_CACHE_SIZE):
+        self.bullets = [str(b) for b in bullets]
+        self.max_ngram = max_ngram
+        self._norm = [_tokenize(b) for b in self.bullets]
+        self._grams: Dict[str, List[int]] = {}
+        for i, text in enumerate(self._norm):
+            words = _WORD_RE.findall(text)
+            grams = {
+                " ".join(words[k:k + n])
+                for n in range(1, max_ngram + 1)
+                for k in range(len(words) - n + 1)
+            }
+            for g in grams:
+                self._grams.setdefault(g, []).append(i)
+        self.max_postings = max_postings
+        self._pinned: Dict[str, Dict[int, int]] = {}
+        self._postings: "OrderedDict[str, Dict[int, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        for v in vocabulary or ():
+            v = _tokenize(v)
+            self._pinned[v] = self._resolve(v)
+
+    def _candidates(self, variant: str) -> Iterable[int]:
+        words = _WORD_RE.findall(variant)
+        if not words:
+            return range(len(self.bullets))
+        if len(words) <= self.max_ngram:
+            return self._grams.get(" ".join(words), [])
+        # longer than any posted n-gram: intersect the postings of its n-gram windows
+        n = self.max_ngram
+        lists = [self._grams.get(" ".join(words[k:k + n]), []) for k in range(len(words) - n + 1)]
+        lists.sort(key=len)
+        ids: Set[int] = set(lists[0])
+        for other in lists[1:]:
+            ids.intersection_update(other)
+        return sorted(ids)
+
+    def variant_postings(self, variant: str) -> Dict[int, int]:
+        """bullet_id -> number of word-bounded occurrences of `variant` (lowercase)."""
+        variant = _tokenize(variant)
+        with self._lock:
+            hit = self._pinned.get(variant)
+            if hit is None:
+                hit = self._postings.get(variant)
+                if hit is not None:
+                    self._postings.move_to_end(variant)
+        if hit is not None:
+            return hit
+        postings = self._resolve(variant)
+        with self._lock:
+            self._postings[variant] = postings
+            self._postings.move_to_end(variant)
+            while len(self._postings) > self.max_postings:
+                self._postings.popitem(last=False)
+        return postings
+
+    def _resolve(self, variant: str) -> Dict[int, int]:
+        """Verify the n-gram candidates of a normalized `variant` with the compiled matcher."""
+        postings: Dict[int, int] = {}
+        if variant:
+            matcher = _VariantMatcher([variant])
+            candidates = self._candidates(variant)
+            for i in candidates:
+                counts, _ = _tally(matcher.scan(self._norm[i]))
+                if counts:
+                    postings[i] = counts[variant]
+            inc("bank_rows_scanned", len(candidates))
+        return postings
+
+    def term_postings(self, variants: Iterable[str]) -> Dict[int, int]:
+        """bullet_id -> total hits over all variants of one term (its density in that bullet)."""
+        out: Dict[int, int] = {}
+        for v in dict.fromkeys(variants):
+            for i, n in self.variant_postings(v).items():
+                out[i] = out.get(i, 0) + n
+        return out
+
+    def bullets_with_term(self, variants: Iterable[str]) -> List[int]:
+        """Ids of the bullets that contain any variant of a term (e.g. a missing JD term)."""
+        return sorted(self.term_postings(variants))
+
+    def bullets_with_min_matches(
+        self,
+        term_variants: Dict[str, List[str]],
+        min_matches: int = 1,
+    ) -> Dict[int, Tuple[int, int]]:
+        """
+        Bullets hitting at least `min_matches` distinct JD terms.
+
+        `term_variants` maps each JD term to its variants (e.g. `JDProfile.terms` as a dict).
+        Returns bullet_id -> (distinct terms hit, total hits), merged from the posting lists
+        of the terms instead of scanning every bullet.
+        """
+        terms_hit: Dict[int, int] = {}
+        total: Dict[int, int] = {}
+        for term, variants in term_variants.items():
+            for i, n in self.term_postings([term] + list(variants or [])).items():
+                terms_hit[i] = terms_hit.get(i, 0) + 1
+                total[i] = total.get(i, 0) + n
+        return {
+            i: (k, total[i]) for i, k in terms_hit.items() if k >= min_matches
+        }
+
+_index_cache: Dict[str, Tuple[object, BankTermIndex]] = {}
+_index_lock = threading.Lock()
+
+def load_term_index(bank_path: str) -> BankTermIndex:
+    """
+    The `BankTermIndex` over `bullet_text` of the bank at `bank_path`.
+
+    Built once per loaded bank version: it is cached next to the `load_bank` frame and
+    rebuilt only when that frame is (i.e. when the CSV changes).
+    """
+    key = os.path.abspath(bank_path)
+    df = load_bank(key)
+    with _index_lock:
+        hit = _index_cache.get(key)
+    if hit is not None and hit[0] is df:
+        return hit[1]
+    index = BankTermIndex(df["bullet_text"].tolist())
+    with _index_lock:
+        _index_cache[key] = (df, index)
+    return index
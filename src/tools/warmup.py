@@ -0,0 +1,80 @@
+import json
+import os
+import time
+from typing import Dict, Iterable, List, Optional
+
+from src.common.variants import warm_variant_cache
+from src.tools.scoring import get_jd_profile
+
+# What a worker preloads before it accepts traffic (comma-separated bank CSVs; a JSON file
+# with a list of {"must_terms", "synonyms"} JDs whose matchers are compiled up front)
+WARMUP_BANK_PATHS = [p for p in os.getenv("WARMUP_BANK_PATHS", "").split(",") if p.strip()]
+WARMUP_JDS_PATH = os.getenv("WARMUP_JDS_PATH", "")
+
+# Heavy dependencies that are otherwise imported on first use
+WARMUP_MODULES = ("pandas", "numpy")
+
+def _load_jds(path: str) -> List[Dict]:
+    with open(path, encoding="utf-8") as f:
+        jds = json.load(f)
+    return jds if isinstance(jds, list) else [jds]
+
+def warm_up(
+    bank_paths: Iterable[str] = (),
+    jds: Iterable[Dict] = (),
+    vocabulary_path: Optional[str] = None,
+    modules: Iterable[str] = WARMUP_MODULES,
+) -> Dict[str, float]:
+    """
+    Preload everything a first request would otherwise pay for; returns seconds per step.
+
+    - modules: import the lazily-loaded heavy dependencies (missing ones are skipped)
+    - banks: parse each bank (writing its compiled sidecar) and build its term, role and
+      relevance indexes
+    - variants: fill the shared variant cache from the skills vocabulary
+    - jd_profiles: compile the matcher of each JD ({"must_terms", "synonyms"}) into the
+      profile cache
+    """
+    timings: Dict[str, float] = {}
+
+    started = time.perf_counter()
+    for name in modules:
+        try:
+            __import__(name)
+        except ImportError:
+            pass
+    timings["modules"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    bank_paths = [p.strip() for p in bank_paths if p and p.strip()]
+    if bank_paths:
+        from src.tools.bank import load_bank
+        from src.tools.relevance import load_relevance_index
+        from src.tools.role_index import load_role_index
+        from src.tools.term_index import load_term_index
+
+        for path in bank_paths:
+            load_bank(path, write_sidecar=True)
+            load_term_index(path)
+            load_role_index(path)
+            load_relevance_index(path)
+    timings["banks"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    warm_variant_cache(vocabulary_path)
+    timings["variants"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for jd in jds:
+        get_jd_profile(jd.get("must_terms") or [], jd.get("synonyms") or {})
+    timings["jd_profiles"] = time.perf_counter() - started
+    return timings
+
+def warm_up_from_env() -> Dict[str, float]:
+    """`warm_up` with WARMUP_BANK_PATHS, WARMUP_JDS_PATH and VARIANT_VOCAB_PATH."""
+    jds = _load_jds(WARMUP_JDS_PATH) if WARMUP_JDS_PATH and os.path.exists(WARMUP_JDS_PATH) else []
+    return warm_up(WARMUP_BANK_PATHS, jds)
+
+def enable_warmup(app) -> None:
+    """Run `warm_up_from_env` at app startup, so the worker only serves once it is warm."""
+    app.router.on_startup.append(warm_up_from_env)
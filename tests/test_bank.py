@@ -0,0 +1,368 @@
+# tests/test_bank.py
+import os
+
+from tests.conftest import mk_bank
+from src.tools.bank import clear_bank_cache, compile_bank, load_bank, sidecar_path
+
+ROWS = [
+    {"role_title": "Mgr", "company": "A", "location": "HK", "start_yyyy_mm": "2023-01",
+     "end_yyyy_mm": "2024-12", "bullet_text": "Built Power-BI dashboards",
+     "recency_score": 0.9, "impact_score": 0.8, "leadership_score": 0.4},
+    {"role_title": "Mgr", "company": "A", "location": "HK", "start_yyyy_mm": "2023-01",
+     "end_yyyy_mm": "2024-12", "bullet_text": "Owned SQL pipeline orchestration",
+     "recency_score": "", "impact_score": 0.7, "leadership_score": 0.5},
+]
+
+
+# ==========================
+# cached experience bank loads
+# ==========================
+def test_load_bank_is_cached_until_file_changes(tmp_path):
+    clear_bank_cache()
+    bank = mk_bank(tmp_path, ROWS)
+
+    df1 = load_bank(bank)
+    assert load_bank(bank) is df1                       # served from the process cache
+    assert df1["recency_score"].tolist() == [0.9, 0.0]  # typed, blanks -> 0.0
+    assert str(df1["company"].dtype) == "category"
+
+    mk_bank(tmp_path, ROWS + [dict(ROWS[0], bullet_text="Presented insights to execs")])
+    df2 = load_bank(bank)
+    assert df2 is not df1
+    assert len(df2) == 3
+
+
+def test_compiled_sidecar_roundtrip_and_staleness(tmp_path):
+    clear_bank_cache()
+    bank = mk_bank(tmp_path, ROWS)
+
+    side = compile_bank(bank)
+    assert os.path.exists(side) and side == sidecar_path(bank)
+
+    clear_bank_cache()
+    assert load_bank(bank)["bullet_text"].tolist() == [r["bullet_text"] for r in ROWS]
+
+    # a rewritten CSV makes the sidecar stale: it must be ignored, not trusted
+    mk_bank(tmp_path, ROWS[:1])
+    clear_bank_cache()
+    assert len(load_bank(bank)) == 1
+
+
+def test_unreadable_sidecar_falls_back_to_csv(tmp_path):
+    import pickle
+
+    clear_bank_cache()
+    bank = mk_bank(tmp_path, ROWS)
+    compile_bank(bank)
+    clear_bank_cache()
+    assert load_bank(bank)["recency_score"].tolist() == [0.9, 0.0]
+
+    # a pickle (or any other junk) in the sidecar's place is never executed, just ignored
+    for junk in (pickle.dumps({"signature": None, "frame": None}), pickle.dumps([1, 2]), b"PK\x03\x04"):
+        with open(sidecar_path(bank), "wb") as f:
+            f.write(junk)
+        clear_bank_cache()
+        assert load_bank(bank)["bullet_text"].tolist() == [r["bullet_text"] for r in ROWS]
+
+
+# ==========================
+# inverted term index
+# ==========================
+def test_term_index_postings_and_min_matches(tmp_path):
+    from src.tools.term_index import BankTermIndex, load_term_index
+
+    bullets = [
+        "Built Power-BI dashboards",
+        "Owned SQL pipelines and Power BI models; power bi admin",
+        "Presented insights to execs",
+    ]
+    idx = BankTermIndex(bullets)
+
+    assert idx.variant_postings("power bi") == {1: 2}           # word-bounded, hyphen differs
+    assert idx.term_postings(["power bi", "power-bi"]) == {0: 1, 1: 2}
+    assert idx.bullets_with_term(["sql pipelines"]) == [1]
+    assert idx.bullets_with_min_matches(
+        {"power bi": ["power-bi"], "sql pipelines": []}, min_matches=2
+    ) == {1: (2, 3)}
+
+    clear_bank_cache()
+    bank = mk_bank(tmp_path, ROWS)
+    assert load_term_index(bank) is load_term_index(bank)
+    assert load_term_index(bank).bullets_with_term(["power-bi"]) == [0]
+
+
+def test_term_index_postings_memo_is_bounded(tmp_path):
+    from src.tools.term_index import BankTermIndex
+
+    idx = BankTermIndex(["Built Power-BI dashboards", "Owned SQL pipelines"],
+                        vocabulary=["Power BI"], max_postings=2)
+    for v in ("sql", "dashboards", "pipelines", "built", "owned"):
+        idx.variant_postings(v)
+    assert list(idx._postings) == ["built", "owned"]            # LRU, oldest evicted
+    assert list(idx._pinned) == ["power bi"]                    # build-time vocabulary stays
+    assert idx.variant_postings("sql pipelines") == {1: 1}
+    assert idx.variant_postings("power-bi") == {0: 1} and len(idx._postings) == 2
+
+
+# ==========================
+# role-grouped, pre-ranked bank view
+# ==========================
+def test_role_index_groups_and_ranks(tmp_path):
+    from src.tools.role_index import load_role_index
+
+    clear_bank_cache()
+    rows = ROWS + [
+        dict(ROWS[0], bullet_text="Presented insights to execs", recency_score=0.1),
+        dict(ROWS[0], company="B", bullet_text="Ran BI platform", recency_score=0.9),
+    ]
+    idx = load_role_index(mk_bank(tmp_path, rows))
+    role_a = ("Mgr", "A", "HK", "2023-01", "2024-12")
+
+    assert idx.role_for("built power-bi   DASHBOARDS") == role_a
+    assert list(idx.group_by_role(["Ran BI platform", "unknown"])) == [
+        ("Mgr", "B", "HK", "2023-01", "2024-12")
+    ]
+    # composite score (recency + impact + leadership): 2.1, 1.2, 1.3
+    assert [idx.bullets[i] for i in idx.ranked(role_a)] == [
+        "Built Power-BI dashboards",
+        "Presented insights to execs",
+        "Owned SQL pipeline orchestration",
+    ]
+    top = idx.top_k(role_a, 1, exclude=["Built Power-BI dashboards"],
+                    key=lambda i: "sql" in idx.bullets[i].lower())
+    assert [idx.bullets[i] for i in top] == ["Owned SQL pipeline orchestration"]
+
+
+# ==========================
+# vectorized swap evaluator
+# ==========================
+def test_evaluate_bank_swaps_prefers_same_role_and_avoids_conflicts(tmp_path):
+    from src.tools.promotions import evaluate_bank_swaps
+
+    clear_bank_cache()
+    gamma = {"role_title": "Analytics Manager", "company": "Gamma", "location": "HK",
+             "start_yyyy_mm": "2023-01", "end_yyyy_mm": "2024-01"}
+    delta = {"role_title": "BI Developer", "company": "Delta", "location": "HK",
+             "start_yyyy_mm": "2020-01", "end_yyyy_mm": "2021-12"}
+    bank = mk_bank(tmp_path, [
+        dict(gamma, bullet_text="Owned dashboards automation for execs"),
+        dict(gamma, bullet_text="Built Power BI dashboards for executive reporting"),
+        dict(delta, bullet_text="Power BI data modeling at scale"),
+        dict(delta, bullet_text="Wrote SQL pipelines"),
+    ])
+    selected = ["Owned dashboards automation for execs"]
+
+    out = evaluate_bank_swaps(
+        selected, ["power bi", "dashboard", "sql"], {"dashboard": ["dashboards"]}, bank,
+        density_target=2, max_promotions=3,
+    )
+
+    promos = out["promotions"]
+    assert len(promos) == 1                              # only one selected bullet to swap out
+    assert promos[0]["role_tuple"][1] == "Gamma"
+    assert promos[0]["same_role"] is True
+    assert promos[0]["new_terms"] == ["power bi"]
+    assert out["stats"]["swaps_evaluated"] >= 3
+
+
+def test_evaluate_bank_swaps_uses_term_postings(tmp_path, monkeypatch):
+    import src.tools.promotions as promotions
+    from src.tools.term_index import load_term_index
+
+    clear_bank_cache()
+    rows = [dict(ROWS[0], bullet_text=t) for t in (
+        "Built Power BI dashboards; power-bi admin", "Wrote SQL pipelines and sql pipelines docs",
+        "Power BI and SQL pipelines for finance", "Organized the offsite",
+    )]
+    bank = mk_bank(tmp_path, rows)
+    selected = ["Organized the offsite", "Presented insights"]
+    terms, syns = ["power bi", "sql pipelines"], {"power bi": ["power-bi"]}
+    index = load_term_index(bank)
+    scanned = promotions.evaluate_swaps(selected, index.bullets, terms, syns, max_promotions=2)
+
+    seen = []
+    real = promotions.term_count_matrix
+    monkeypatch.setattr(promotions, "term_count_matrix",
+                        lambda profile, bullets: seen.append(list(bullets)) or real(profile, bullets))
+    out = promotions.evaluate_bank_swaps(selected, terms, syns, bank, max_promotions=2)
+    assert seen == [selected] and len(out["promotions"]) == 2     # only the selection is scanned
+    assert [(p["from_bullet"], p["to_bullet"], p["gain"]) for p in out["promotions"]] == [
+        (p["from_bullet"], p["to_bullet"], p["gain"]) for p in scanned["promotions"]]
+
+
+# ==========================
+# realign feasibility bound
+# ==========================
+def test_realign_feasibility_short_circuits(tmp_path):
+    from src.tools.feasibility import realign_feasibility
+
+    clear_bank_cache()
+    bank = mk_bank(tmp_path, ROWS)                     # has power-bi and "sql pipeline"
+    resume = "SUMMARY\nAnalyst\nEXPERIENCE\n- Built dashboards\n"
+    kw = dict(coverage_target=0.9, density_target=1, placement_target=0.5)
+
+    hopeless = realign_feasibility(resume, ["power bi", "kubernetes"], {"power bi": ["power-bi"]},
+                                   bank, **kw)
+    assert hopeless["should_iterate"] is False
+    assert hopeless["reason"] == "unreachable"
+    assert hopeless["unreachable_terms"]["coverage"] == ["kubernetes"]
+    assert hopeless["max_coverage"] == 0.5
+
+    doable = realign_feasibility(resume, ["power bi", "dashboard"],
+                                 {"power bi": ["power-bi"], "dashboard": ["dashboards"]}, bank, **kw)
+    assert doable["reason"] == "reachable" and doable["should_iterate"] is True
+
+    done = realign_feasibility(resume, ["dashboard"], {"dashboard": ["dashboards"]}, bank, **kw)
+    assert done["reason"] == "targets_met"
+
+
+def test_realign_feasibility_missing_low_density_term_can_stay_missing(tmp_path):
+    from src.tools.feasibility import realign_feasibility
+
+    clear_bank_cache()
+    present = ["python", "sql", "spark", "airflow", "dbt", "excel", "kafka", "snowflake", "pandas",
+               "docker", "git", "jira", "statistics", "forecasting", "etl", "aws", "gcp", "azure"]
+    rows = [dict(ROWS[0], bullet_text="Built Tableau views"),
+            dict(ROWS[0], bullet_text="Rolled out Looker and trained teams on Looker")]
+    bank = mk_bank(tmp_path, rows)
+    resume = "EXPERIENCE\n" + "".join(f"- Used {t} daily; {t} owner\n" for t in present)
+    kw = dict(coverage_target=0.95, density_target=2, placement_target=0.7)
+
+    # tableau can only reach 1 hit, so it stays missing; adding looker still meets coverage
+    res = realign_feasibility(resume, present + ["tableau", "looker"], {}, bank, **kw)
+    assert res["reason"] == "reachable" and res["should_iterate"] is True
+    assert res["unreachable_terms"]["coverage"] == ["tableau"]
+    assert res["unreachable_terms"]["density"] == []
+    assert res["max_coverage"] == 0.95
+
+    # a term already present below target that the bank cannot lift still blocks
+    stuck = realign_feasibility(resume + "- Some tableau\n", present + ["tableau", "looker"], {},
+                                bank, **dict(kw, density_target=3))
+    assert stuck["reason"] == "unreachable"
+    assert "tableau" in stuck["unreachable_terms"]["density"]
+
+
+# ==========================
+# bulk offline alignment
+# ==========================
+def test_bulk_align_writes_jsonl_and_resumes(tmp_path):
+    import json
+    from src.tools.bulk_align import run
+
+    clear_bank_cache()
+    bank = mk_bank(tmp_path, ROWS)
+    jds = tmp_path / "jds"
+    jds.mkdir()
+    (jds / "a.json").write_text(json.dumps({"jd_phrases": ["sql pipelines"], "jd_atomic": ["power bi"]}))
+    (jds / "b.json").write_text(json.dumps({"must_terms": ["kubernetes"], "title": "SRE"}))
+    out = tmp_path / "out.jsonl"
+
+    assert run(str(jds), bank, str(out), processes=2) == {
+        "total": 2, "skipped": 0, "written": 2, "failed": 0}
+    a, b = [json.loads(line) for line in out.read_text().splitlines()]
+    assert a["jd"] == "a.json" and a["coverage"] == 1.0 and a["placement_ratio"] == 1.0
+    assert {s["bullet"] for s in a["selected"]} == {r["bullet_text"] for r in ROWS}
+    assert b["title"] == "SRE" and b["missing_terms"] == ["kubernetes"] and b["selected"] == []
+
+    # interrupted run: last line cut short -> rewritten, finished JDs skipped
+    out.write_text(out.read_text().splitlines()[0] + '\n{"jd": "b.js')
+    assert run(str(jds), bank, str(out), processes=1) == {
+        "total": 2, "skipped": 1, "written": 1, "failed": 0}
+    assert [json.loads(line)["jd"] for line in out.read_text().splitlines()] == ["a.json", "b.json"]
+
+
+def test_bulk_align_records_malformed_jd_and_moves_on(tmp_path):
+    import json
+    from src.tools.bulk_align import run
+
+    clear_bank_cache()
+    bank = mk_bank(tmp_path, ROWS)
+    jds = tmp_path / "jds"
+    jds.mkdir()
+    (jds / "a.json").write_text(json.dumps({"must_terms": ["power bi"]}))
+    (jds / "b.json").write_text("{not json")
+    (jds / "c.json").write_text(json.dumps({"must_terms": ["sql pipelines"]}))
+    out = tmp_path / "out.jsonl"
+
+    for processes in (1, 2):
+        out.unlink(missing_ok=True)
+        assert run(str(jds), bank, str(out), processes=processes) == {
+            "total": 3, "skipped": 0, "written": 3, "failed": 1}
+        a, b, c = [json.loads(line) for line in out.read_text().splitlines()]
+        assert b["jd"] == "b.json" and b["error"].startswith("JSONDecodeError")
+        assert "error" not in a and c["coverage"] == 1.0
+
+    # the error record is a checkpoint too: a resumed run does not retry (or stop at) it
+    assert run(str(jds), bank, str(out), processes=1) == {
+        "total": 3, "skipped": 3, "written": 0, "failed": 0}
+
+
+# ==========================
+# TF-IDF relevance index
+# ==========================
+def test_relevance_index_ranks_near_misses_and_roundtrips(tmp_path):
+    import numpy as np
+    from src.tools.relevance import compile_relevance_index, load_relevance_index, tfidf_path
+
+    clear_bank_cache()
+    rows = ROWS + [
+        dict(ROWS[0], bullet_text="Presented quarterly results", skills="power bi;dashboard design"),
+        dict(ROWS[0], bullet_text="Organized the team offsite"),
+    ]
+    bank = mk_bank(tmp_path, rows)
+    index = load_relevance_index(bank)
+    assert load_relevance_index(bank) is index
+
+    ranked = index.rank(["power bi", "dashboards"], {"power bi": ["power-bi"]}, k=3)
+    assert [i for i, _ in ranked] == [0, 2]          # row 2 only mentions them in `skills`
+    assert ranked[0][1] > ranked[1][1] > 0
+    assert index.rank(["kubernetes"]) == []
+    assert [i for i, _ in index.rank(["sql pipelines", "offsite"], k=1)] == [1]
+
+    compile_relevance_index(bank)
+    clear_bank_cache()
+    loaded = load_relevance_index(bank)
+    assert loaded is not index and os.path.exists(tfidf_path(bank))
+    assert np.allclose(loaded.jd_scores(["power bi"]), index.jd_scores(["power bi"]))
+
+    with open(tfidf_path(bank), "r+b") as f:                # truncated index: rebuilt, not raised
+        f.truncate(64)
+    clear_bank_cache()
+    assert np.allclose(load_relevance_index(bank).jd_scores(["power bi"]), index.jd_scores(["power bi"]))
+
+
+# ==========================
+# speculative realign drafts
+# ==========================
+def test_speculative_realign_keeps_best_draft(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+    from src.tools.drafts import build_drafts, speculative_realign
+
+    clear_bank_cache()
+    rows = ROWS + [
+        dict(ROWS[0], bullet_text="Presented insights to execs", recency_score=0.99),
+        dict(ROWS[0], bullet_text="Built tableau dashboards for sales"),
+        dict(ROWS[0], company="B", bullet_text="Ran weekly standups"),
+        dict(ROWS[0], company="B", bullet_text="Migrated tableau workbooks"),
+    ]
+    bank = mk_bank(tmp_path, rows)
+    terms, syns = ["power bi", "tableau", "sql"], {"power bi": ["power-bi"]}
+    selected = ["Presented insights to execs", "Ran weekly standups"]
+
+    drafts = build_drafts(selected, terms, syns, bank, density_target=1)
+    assert len(drafts) > 1
+    assert all(d["bullets"] != selected for d in drafts)
+    assert any(d["backfill"] and not d["promotions"] for d in drafts)
+
+    kw = dict(coverage_target=1.0, density_target=1, placement_target=1.0, max_iterations=3)
+    out = speculative_realign(selected, "SUMMARY\nAnalyst", terms, syns, bank, **kw)
+    assert out["reason"] == "targets_met" and out["iterations"] == 1
+    assert out["report"]["coverage"] == 1.0 and out["report"]["placement_ratio"] == 1.0
+    assert out["history"][0]["drafts"] == len(drafts)
+
+    with ThreadPoolExecutor(2) as pool:
+        pooled = speculative_realign(selected, "SUMMARY\nAnalyst", terms, syns, bank, executor=pool, **kw)
+    assert pooled["bullets"] == out["bullets"]
+
+    stuck = speculative_realign(["Ran weekly standups"], "", ["kubernetes"], {}, bank, **kw)
+    assert stuck["reason"] == "no_improvement" and stuck["bullets"] == ["Ran weekly standups"]
@@ -0,0 +1,370 @@
+# tests/test_runtime.py
+import asyncio
+import os
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from src.common import llm
+from src.common.executors import run_cpu, shutdown_cpu_executor
+from src.tools.fake_llm import app as fake_llm_app
+from src.tools.scoring import compute_metrics
+
+
+# ==========================
+# executor offload
+# ==========================
+def test_run_cpu_offloads_scoring():
+    async def go():
+        return await run_cpu(compute_metrics, "EXPERIENCE\n- SQL", ["sql"], {}, density_target=1)
+
+    out = asyncio.run(go())
+    shutdown_cpu_executor()
+    assert out["coverage"] == 1.0
+
+
+# ==========================
+# pooled LLM client limits
+# ==========================
+def test_llm_request_scope_caps_in_flight_calls(monkeypatch):
+    state = {"now": 0, "peak": 0}
+
+    async def create(model, messages, **params):
+        state["now"] += 1
+        state["peak"] = max(state["peak"], state["now"])
+        await asyncio.sleep(0.01)
+        state["now"] -= 1
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="ok"))])
+
+    fake = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(llm, "get_async_client", lambda: fake)
+
+    async def go():
+        async with llm.llm_request_scope(max_concurrency=2):
+            msgs = [{"role": "user", "content": "x"}]
+            return await asyncio.gather(*[
+                llm.chat_completion(msgs, model="m", use_cache=False) for _ in range(6)
+            ])
+
+    assert asyncio.run(go()) == ["ok"] * 6
+    assert state["peak"] == 2
+
+
+def test_fake_llm_server_speaks_chat_completions(monkeypatch):
+    import src.tools.fake_llm as fake_llm
+    monkeypatch.setattr(fake_llm, "FAKE_LLM_LATENCY_MS", 0)
+
+    resp = TestClient(fake_llm_app).post("/v1/chat/completions", json={
+        "model": "gpt-test", "messages": [{"role": "user", "content": "rewrite this"}],
+    })
+    assert resp.status_code == 200
+    assert resp.json()["choices"][0]["message"]["content"] == "rewrite this"
+
+
+# ==========================
+# on-disk LLM response cache
+# ==========================
+def test_llm_cache_serves_repeats_and_evicts(tmp_path, monkeypatch):
+    from src.common.llm_cache import LLMCache, cache_key
+
+    cache = LLMCache(str(tmp_path / "llm.sqlite3"), max_entries=2)
+    calls = []
+
+    async def create(model, messages, **params):
+        calls.append(messages)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="v1"))])
+
+    fake = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(llm, "get_async_client", lambda: fake)
+    monkeypatch.setattr(llm, "get_llm_cache", lambda: cache)
+
+    async def ask(text, **kw):
+        return await llm.chat_completion([{"role": "user", "content": text}], model="m", **kw)
+
+    assert asyncio.run(ask("Rewrite  this\nbullet")) == "v1"
+    assert asyncio.run(ask("Rewrite this bullet")) == "v1"            # normalized prompt: hit
+    assert asyncio.run(ask("Rewrite this bullet", use_cache=False)) == "v1"
+    assert len(calls) == 2
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1}
+
+    for i in range(3):
+        cache.put(cache_key("m", [{"role": "user", "content": str(i)}]), str(i))
+    cache.evict()
+    assert cache.stats()["entries"] == 2
+    cache.close()
+
+
+# ==========================
+# streaming realign progress
+# ==========================
+def test_realign_events_stream_as_ndjson_and_sse():
+    import json
+    from fastapi import FastAPI, Request
+    from src.api.streaming import realign_events, stream_events
+
+    bullets = ["Owned dashboards automation"]
+    terms = ["dashboard", "power bi"]
+    syns = {"dashboard": ["dashboards"]}
+
+    async def score():
+        return compute_metrics("EXPERIENCE\n" + "\n".join(bullets), terms, syns, density_target=1)
+
+    async def propose(report):
+        return [{"from_bullet": bullets[0], "to_bullet": "Built Power BI dashboards"}]
+
+    async def apply(promos):
+        bullets[:] = [p["to_bullet"] for p in promos]
+
+    app = FastAPI()
+
+    @app.post("/realign/stream")
+    async def realign_stream(request: Request):
+        events = realign_events(score, propose, apply, lambda r: r["coverage"] >= 1.0, 3)
+        return stream_events(events, request)
+
+    client = TestClient(app)
+    resp = client.post("/realign/stream")
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in resp.text.splitlines()]
+    assert [e["event"] for e in events] == ["iteration", "promotions", "iteration", "done"]
+    assert events[0]["report"]["missing_terms"] == ["power bi"]
+    assert events[2]["report"]["coverage"] == 1.0
+    assert events[-1]["reason"] == "targets_met"
+
+    bullets[:] = ["Owned dashboards automation"]
+    sse = client.post("/realign/stream", headers={"Accept": "text/event-stream"})
+    assert sse.headers["content-type"].startswith("text/event-stream")
+    assert sse.text.startswith("event: iteration\ndata: {")
+
+
+# ==========================
+# stage timing / metrics endpoint
+# ==========================
+def test_metrics_endpoint_reports_stage_latency_and_counters():
+    from fastapi import FastAPI
+    from src.api.metrics import enable_metrics
+    from src.common.metrics import detach_collector, get_collector, stage
+
+    detach_collector()
+    with stage("term_match"):                           # no collector: no-op
+        pass
+    assert get_collector() is None
+
+    app = FastAPI()
+    enable_metrics(app)
+    try:
+        compute_metrics("EXPERIENCE\n- SQL and sql", ["sql", "python"], {})
+        snap = get_collector().snapshot()
+        assert snap["stages"]["term_match"]["count"] == 1
+        assert snap["counters"]["terms_scored"] == 2
+        assert snap["counters"]["variants_matched"] == 2
+
+        text = TestClient(app).get("/metrics").text
+        assert 'ats_stage_seconds_count{stage="section_parse"} 1' in text
+        assert 'ats_stage_seconds_bucket{stage="term_match",le="+Inf"} 1' in text
+        assert "ats_terms_scored_total 2" in text
+    finally:
+        detach_collector()
+
+
+# ==========================
+# shared variant cache
+# ==========================
+def test_variant_cache_warms_from_vocabulary_and_counts_hits(tmp_path):
+    from src.common.metrics import attach_collector, detach_collector
+    from src.common.variants import save_vocabulary, term_variants, warm_variant_cache
+
+    term_variants.cache.clear()
+    vocab = tmp_path / "skills.txt"
+    vocab.write_text("# skills\nPower BI\ncross-functional teams\n")
+    assert warm_variant_cache(str(vocab)) == 2
+    assert warm_variant_cache(str(tmp_path / "missing.txt")) == 0
+
+    collector = attach_collector()
+    try:
+        assert term_variants("  power   BI ") == ["power bi", "power-bi"]
+        assert "cross functional team" in term_variants("Cross-Functional Teams")
+        assert term_variants("sql pipelines")[:3] == ["sql pipelines", "sql-pipelines", "sql pipeline"]
+        counters = collector.snapshot()["counters"]
+        assert counters["variant_cache_hits"] == 2
+        assert counters["variant_cache_misses"] == 1
+    finally:
+        detach_collector()
+
+    assert save_vocabulary(str(vocab)) == 3
+    assert vocab.read_text().splitlines()[0] == "sql pipelines"
+    term_variants.cache.clear()
+
+
+def test_term_variants_singularize_es_plurals():
+    from src.common.variants import canonical_variant_map, term_variants
+    from src.tools.scoring import compute_metrics
+
+    term_variants.cache.clear()
+    expected = {
+        "databases": "database", "use cases": "use case", "releases": "release",
+        "caches": "cache", "analyses": "analysis", "processes": "process", "boxes": "box",
+    }
+    for plural, singular in expected.items():
+        assert singular in term_variants(plural)
+    assert "databas" not in term_variants("databases")
+
+    # short words and acronyms are never inflected
+    for term in ("aws", "js", "os", "ms", "ios", "sas", "gis", "sql", "apis", "basis", "power bi"):
+        assert not any(v in ("aw", "j", "o", "m", "io", "sa", "ges", "sqls", "apes", "bases")
+                       for v in term_variants(term)), term
+    assert term_variants("aws") == ["aws"]
+    aws = compute_metrics("EXPERIENCE\n- Shipped to aw and m\n", ["aws"],
+                          canonical_variant_map(["aws"]), density_target=1)
+    assert aws["coverage"] == 0.0
+
+    syns = canonical_variant_map(["databases"])
+    report = compute_metrics("EXPERIENCE\n- Tuned the database\n", ["databases"], syns, density_target=1)
+    assert report["coverage"] == 1.0
+    term_variants.cache.clear()
+
+
+# ==========================
+# compiled docx rendering
+# ==========================
+def test_compiled_docx_template_renders_batches(tmp_path):
+    import io
+    import zipfile
+
+    import pytest
+    docx = pytest.importorskip("docx")
+    from src.tools.docx_render import compile_template, render_batch, resume_context
+
+    tpl = docx.Document()
+    tpl.add_heading("{{name}}", 0)
+    p = tpl.add_paragraph()
+    p.add_run("Contact: {{con")                       # placeholder split across runs
+    p.add_run("tact}}").bold = True
+    tpl.add_paragraph("{{bullets:EXPERIENCE}}", style="List Bullet")
+    tpl.add_paragraph("{{bullets:SKILLS}}", style="List Bullet")
+    tpl.save(tmp_path / "tpl.docx")
+
+    compiled = compile_template(str(tmp_path / "tpl.docx"))
+    assert compiled.fields == ["contact", "name"]
+    assert compiled.sections == ["EXPERIENCE", "SKILLS"]
+
+    ctx = resume_context(
+        "EXPERIENCE\n- Built <SQL> pipelines & dashboards\n• Led teams\nSkills: Python",
+        name="Ada", contact="ada@example.com",
+    )
+    doc = docx.Document(io.BytesIO(compiled.render(ctx)))
+    assert [(q.style.name, q.text) for q in doc.paragraphs] == [
+        ("Title", "Ada"),
+        ("Normal", "Contact: ada@example.com"),
+        ("List Bullet", "Built <SQL> pipelines & dashboards"),
+        ("List Bullet", "Led teams"),
+        ("List Bullet", "Python"),
+    ]
+
+    items = ((f"r{i}.docx", dict(ctx, name=f"R{i}")) for i in range(7))
+    names = render_batch(compiled, items, zip_path=str(tmp_path / "out.zip"), processes=2, chunk_size=2)
+    assert names == [f"r{i}.docx" for i in range(7)]
+    with zipfile.ZipFile(tmp_path / "out.zip") as z:
+        assert docx.Document(io.BytesIO(z.read("r5.docx"))).paragraphs[0].text == "R5"
+
+    render_batch(str(tmp_path / "tpl.docx"), [("one.docx", ctx)], out_dir=str(tmp_path / "out"))
+    assert docx.Document(str(tmp_path / "out" / "one.docx")).paragraphs[0].text == "Ada"
+
+
+def test_compiled_docx_template_keeps_text_boxes(tmp_path):
+    import io
+
+    import pytest
+    docx = pytest.importorskip("docx")
+    from docx.oxml import parse_xml
+    from src.tools.docx_render import compile_template
+
+    W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    tpl = docx.Document()
+    anchor = tpl.add_paragraph("Profile {{name}} ")
+    anchor._p.append(parse_xml(
+        f'<w:r xmlns:w="{W}" xmlns:v="urn:schemas-microsoft-com:vml"><w:pict>'
+        '<v:shape style="width:200pt;height:40pt"><v:textbox><w:txbxContent>'
+        '<w:p><w:r><w:t>{{headline}}</w:t></w:r></w:p>'
+        '</w:txbxContent></v:textbox></v:shape></w:pict></w:r>'
+    ))
+    tpl.add_paragraph("{{contact}}")
+    tpl.save(tmp_path / "tpl.docx")
+
+    compiled = compile_template(str(tmp_path / "tpl.docx"))
+    assert compiled.fields == ["contact", "headline"]         # the anchor is not a slot
+    xml = compiled.render_xml({"name": "Ada", "headline": "Data lead", "contact": "ada@x.io"})
+    assert xml.count("w:txbxContent>") == 2 and "Data lead" in xml
+    doc = docx.Document(io.BytesIO(compiled.render({"headline": "Data lead", "contact": "ada@x.io"})))
+    assert [q.text for q in doc.paragraphs] == ["Profile {{name}} ", "ada@x.io"]
+
+
+# ==========================
+# scoring result cache
+# ==========================
+def test_result_cache_serves_repeat_submissions(tmp_path):
+    from src.tools.result_cache import ResultCache, result_key
+
+    resume = "EXPERIENCE\n- Built SQL   pipelines\n"
+    terms, syns = ["sql"], {"sql": ["etl"]}
+    key = result_key(resume, terms, syns, density_target=2, coverage_target=0.9)
+    assert key == result_key("\nEXPERIENCE \n\n-  Built SQL pipelines", terms, syns,
+                             density_target=2, coverage_target=0.9, placement_target=None)
+    assert key != result_key(resume, terms, syns, density_target=3, coverage_target=0.9)
+    assert key != result_key(resume, terms, {"sql": ["elt"]}, density_target=2, coverage_target=0.9)
+
+    for backend in ("memory", "sqlite"):
+        cache = ResultCache(backend, path=str(tmp_path / "r.sqlite3"), max_entries=1)
+        calls = []
+        compute = lambda: calls.append(1) or compute_metrics(resume, terms, syns)
+        first = cache.get_or_compute(key, compute)
+        again = cache.get_or_compute(key, compute)
+        assert (first["cached"], again["cached"], len(calls)) == (False, True, 1)
+        assert {k: v for k, v in again.items() if k != "cached"} == compute_metrics(resume, terms, syns)
+
+        cache.put("other", {"coverage": 0.0})
+        if backend == "sqlite":
+            cache._store.evict()
+        assert cache.get(key) is None                      # LRU bound of 1 entry
+
+    expiring = ResultCache("memory", ttl_s=1e-9)
+    expiring.put(key, {"coverage": 1.0})
+    assert expiring.get(key) is None
+
+
+# ==========================
+# cold start / warm-up
+# ==========================
+def test_warmup_preloads_bank_variants_and_jd_profiles(tmp_path, monkeypatch):
+    import subprocess
+    import sys
+
+    from fastapi import FastAPI
+    from tests.conftest import mk_bank
+    from src.common.variants import term_variants
+    from src.tools import bank as bank_mod, warmup
+    from src.tools.scoring import _profile_cache, clear_jd_profile_cache, jd_profile_key
+
+    # heavy dependencies stay out of the scoring / bank import path
+    probe = "import sys, src.tools.bank, src.tools.scoring; print('pandas' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True,
+                          check=True).stdout.strip() == "False"
+
+    bank = mk_bank(tmp_path, [{"bullet_text": "Built Power BI dashboards", "role_title": "Mgr"}])
+    (tmp_path / "vocab.txt").write_text("power bi\n")
+    (tmp_path / "jds.json").write_text('[{"must_terms": ["power bi"], "synonyms": {}}]')
+    monkeypatch.setattr(warmup, "WARMUP_BANK_PATHS", [bank])
+    monkeypatch.setattr(warmup, "WARMUP_JDS_PATH", str(tmp_path / "jds.json"))
+    monkeypatch.setattr("src.common.variants.VARIANT_VOCAB_PATH", str(tmp_path / "vocab.txt"))
+    bank_mod.clear_bank_cache()
+    clear_jd_profile_cache()
+    term_variants.cache.clear()
+
+    app = FastAPI()
+    warmup.enable_warmup(app)
+    with TestClient(app):
+        assert os.path.abspath(bank) in bank_mod._bank_cache
+        assert os.path.exists(bank_mod.sidecar_path(bank))
+        assert jd_profile_key(["power bi"], {}) in _profile_cache
+        assert term_variants.cache.terms() == ["power bi"]
+    term_variants.cache.clear()
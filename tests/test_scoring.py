@@ -0,0 +1,219 @@
+# tests/test_scoring.py
+import re
+
+from src.tools.scoring import compute_metrics, _VariantMatcher, _tally
+
+
+# ==========================
+# single-pass variant matcher
+# ==========================
+def test_matcher_counts_like_findall_per_variant():
+    """
+    Overlapping variants ("power bi" / "bi") are counted independently, and each variant
+    follows re.findall semantics (word boundaries, no self-overlap).
+    """
+    text = "power bi, power-bi and bi reports; c++ and c; bi-weekly power bis"
+    variants = ["power bi", "bi", "power", "c++", "c", "power bis"]
+
+    counts, _ = _tally(_VariantMatcher(variants).scan(text))
+
+    for v in variants:
+        expected = len(re.findall(rf"\b{re.escape(v)}\b", text))
+        assert counts.get(v, 0) == expected, v
+
+
+def test_compute_metrics_placement_from_match_offsets():
+    resume = (
+        "SUMMARY\n"
+        "Power BI and SQL enthusiast.\n\n"
+        "EXPERIENCE\n"
+        "- Built ETL pipelines feeding Power-BI dashboards.\n"
+    )
+    syns = {"sql": ["etl"], "POWER BI": ["power-bi"]}
+
+    out = compute_metrics(resume, ["power bi", "sql", "tableau"], syns, density_target=2)
+    by_term = {r["term"]: r for r in out["term_results"]}
+
+    assert by_term["power bi"]["density"] == 2
+    assert by_term["power bi"]["in_experience"] is True      # via the hyphen synonym
+    assert by_term["sql"]["density"] == 2
+    assert by_term["sql"]["in_experience"] is True           # "etl" only appears in experience
+    assert out["missing_terms"] == ["tableau"]
+    assert out["placement_ratio"] == 2 / 3
+
+
+# ==================
+# JD profile caching
+# ==================
+def test_jd_profile_is_cached_by_content():
+    from src.tools.scoring import get_jd_profile, clear_jd_profile_cache
+
+    clear_jd_profile_cache()
+    terms = ["power bi", "sql"]
+    p1 = get_jd_profile(terms, {"sql": ["etl"]})
+    p2 = get_jd_profile(list(terms), {"sql": ["etl"]})       # equal content, new objects
+    p3 = get_jd_profile(terms, {"sql": ["etl", "elt"]})
+
+    assert p1 is p2
+    assert p3 is not p1
+    assert dict(p3.terms)["sql"] == ["sql", "etl", "elt"]
+
+
+# ====================
+# section segmentation
+# ====================
+def test_parse_sections_span_table():
+    from src.tools.scoring import parse_sections, _tokenize
+
+    resume = (
+        "Jane Doe\n"
+        "SUMMARY\n"
+        "Experienced analyst.\n\n"          # not a header: must not open EXPERIENCE
+        "  EXPERIENCE\n"
+        "- Built Power BI dashboards.\n"
+        "Skills: sql, etl\n"                 # inline header with content
+        "CERTIFICATIONS\n"
+        "PL-300\n"
+    )
+    text, sections = parse_sections(resume)
+
+    assert text == _tokenize(resume)
+    assert [(name, text[a:b]) for name, a, b in sections] == [
+        ("SUMMARY", "experienced analyst."),
+        ("EXPERIENCE", "- built power bi dashboards."),
+        ("SKILLS", "sql, etl"),
+        ("CERTIFICATIONS", "pl-300"),
+    ]
+
+    out = compute_metrics(resume, ["power bi", "sql"], {}, density_target=1)
+    by_term = {r["term"]: r for r in out["term_results"]}
+    assert by_term["power bi"]["sections"] == ["EXPERIENCE"]
+    assert by_term["sql"]["sections"] == ["SKILLS"]
+    assert by_term["sql"]["in_experience"] is False
+
+    # markdown, qualified and Title Case headers open the same sections
+    for header in ("## Experience", "**EXPERIENCE**", "RELEVANT EXPERIENCE",
+                   "Experience (2019-2024)", "Relevant Experience:"):
+        styled = f"{header}\n- Built Power BI dashboards.\n**Skills:** sql\nExperience with SQL\n"
+        text, sections = parse_sections(styled)
+        assert [(name, text[a:b]) for name, a, b in sections] == [
+            ("EXPERIENCE", "- built power bi dashboards."),
+            ("SKILLS", "sql experience with sql"),
+        ], header
+        assert compute_metrics(styled, ["power bi"], {}, density_target=1)["placement_ratio"] == 1.0
+
+    # job titles and skills that start/end with an alias are content, not headers
+    titled = ("EXPERIENCE\nHead of Projects\n- Built Power BI dashboards\nDirector of Education\n"
+              "- Led SQL work\nSKILLS\nCustomer Experience\nPython\n")
+    text, sections = parse_sections(titled)
+    assert [name for name, _, _ in sections] == ["EXPERIENCE", "SKILLS"]
+    assert text[sections[1][1]:sections[1][2]] == "customer experience python"
+    out = compute_metrics(titled, ["power bi", "sql", "python"], {}, density_target=1)
+    assert out["placement_ratio"] == 2 / 3
+
+
+# ==============
+# batch scoring
+# ==============
+def test_compute_metrics_batch_matches_single_calls():
+    from src.tools.scoring import compute_metrics_batch
+
+    resumes = [
+        "EXPERIENCE\n- Built Power BI dashboards\n",
+        "SUMMARY\nSQL person\nEXPERIENCE\n- ETL pipelines\n",
+        "",
+    ] * 5
+    terms, syns = ["power bi", "sql"], {"sql": ["etl"]}
+
+    expected = [compute_metrics(r, terms, syns) for r in resumes]
+    assert compute_metrics_batch(resumes, terms, syns) == expected
+    assert compute_metrics_batch(iter(resumes), terms, syns, processes=2, chunk_size=4) == expected
+
+
+# =======================
+# resume x JD coverage matrix
+# =======================
+def test_coverage_matrix_agrees_with_pairwise_metrics():
+    from src.tools.coverage_matrix import compute_coverage_matrix
+
+    resumes = [
+        "SUMMARY\nSQL and Power BI.\nEXPERIENCE\n- Built ETL pipelines\n",
+        "EXPERIENCE\n- Power BI dashboards, power bi models\n",
+        "Nothing relevant here",
+    ]
+    jds = [
+        (["power bi", "sql"], {"sql": ["etl"]}),
+        (["dashboard", "power bi", ""], {"dashboard": ["dashboards"]}),
+    ]
+
+    M = compute_coverage_matrix(resumes, jds, density_target=2)
+
+    assert M.shape == (3, 2)
+    for i, resume in enumerate(resumes):
+        for j, (terms, syns) in enumerate(jds):
+            expected = compute_metrics(resume, terms, syns, density_target=2)
+            assert M.coverage[i, j] == expected["coverage"]
+            assert M.placement_ratio[i, j] == expected["placement_ratio"]
+            assert M.missing_count[i, j] == len(expected["missing_terms"])
+            assert M.low_density_count[i, j] == len(expected["low_density_terms"])
+            assert M.pair(i, j) == expected
+
+
+# ==============================
+# incremental re-scoring (realign)
+# ==============================
+def _render(sections):
+    return "\n".join(
+        name + "\n" + "\n".join(f"- {b}" for b in bullets) for name, bullets in sections
+    )
+
+
+def test_incremental_scorer_matches_full_rescore():
+    from src.tools.incremental import IncrementalScorer
+
+    terms, syns = ["power bi", "sql", "dashboard"], {"sql": ["etl"], "dashboard": ["dashboards"]}
+    sections = [
+        ("SUMMARY", ["Analyst who likes SQL"]),
+        ("EXPERIENCE", ["Built dashboards for execs", "Presented insights", "Ran ETL jobs"]),
+        ("SKILLS", ["Power BI, sql"]),
+    ]
+    scorer = IncrementalScorer.from_resume(_render(sections), terms, syns, density_target=2)
+    assert scorer.metrics() == compute_metrics(_render(sections), terms, syns, density_target=2)
+
+    # swap one experience bullet, drop another, add a new one
+    exp_ids = list(scorer.bullets("EXPERIENCE"))
+    scorer.swap(exp_ids[1], "- Built Power BI dashboard models")
+    scorer.remove_bullet(exp_ids[2])
+    scorer.add_bullet("- Owned SQL pipelines", "EXPERIENCE")
+    sections[1] = ("EXPERIENCE", [
+        "Built dashboards for execs", "Built Power BI dashboard models", "Owned SQL pipelines",
+    ])
+
+    assert scorer.metrics() == compute_metrics(_render(sections), terms, syns, density_target=2)
+    assert scorer.placement_ratio == 1.0
+
+
+# ==========================
+# compact results
+# ==========================
+def test_compact_metrics_match_dict_results():
+    from src.tools.scoring import CompactMetrics, compute_metrics_batch, get_jd_profile
+
+    resume = "SUMMARY\nPower BI fan\nSKILLS: sql\nEXPERIENCE\n- Built Power-BI and ETL jobs\n"
+    terms, syns = ["power bi", "sql", "tableau", ""], {"power bi": ["power-bi"], "sql": ["etl"]}
+
+    full = compute_metrics(resume, terms, syns, density_target=3)
+    compact = compute_metrics(resume, terms, syns, density_target=3, compact=True)
+    assert compact.to_dict() == full
+    assert compact["missing_terms"] == ["tableau"] and "coverage" in compact
+    assert compact.term_sections(1) == ["EXPERIENCE", "SKILLS"]
+    assert compact.placement_issues == ["tableau"]
+
+    wire = compact.to_json()
+    assert '"variants"' not in wire
+    restored = CompactMetrics.from_json(wire, get_jd_profile(terms, syns))
+    assert restored.to_dict() == full
+
+    batch = compute_metrics_batch([resume] * 3, terms, syns, density_target=3,
+                                  processes=2, chunk_size=1, compact=True)
+    assert [r.to_dict() for r in batch] == [full] * 3